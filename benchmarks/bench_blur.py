@@ -0,0 +1,85 @@
+"""Time of the per-region GaussianBlur loop versus core.blur's shared blur pass.
+
+Regions are text-line sized and scattered over the frame, with some
+overlapping. "diff" is the mean absolute difference inside the regions
+between the downscaled blur and an exact full-resolution GaussianBlur.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_blur --repeat 5
+"""
+import argparse
+import random
+import statistics
+import time
+
+import cv2
+import numpy as np
+
+from core import blur
+from benchmarks.synthetic import RESOLUTIONS, synthetic_corpus_image
+
+REGION_COUNTS = [10, 100, 1000]
+
+
+def _legacy(image, regions):
+    result = image.copy()
+    for (x, y, w, h) in regions:
+        roi = result[y:y + h, x:x + w]
+        if roi.size > 0:
+            result[y:y + h, x:x + w] = cv2.GaussianBlur(roi, blur.BLUR_KERNEL, blur.BLUR_SIGMA)
+    return result
+
+
+def _regions(width: int, height: int, count: int, seed: int = 0) -> list[tuple[int, int, int, int]]:
+    rng = random.Random(seed)
+    scale = max(1, height // 1080)
+    regions = []
+    for _ in range(count):
+        w, h = rng.randint(60, 400) * scale, rng.randint(20, 40) * scale
+        regions.append((rng.randint(0, width - w), rng.randint(0, height - h), w, h))
+    return regions
+
+
+def _mask(shape, regions) -> np.ndarray:
+    mask = np.zeros(shape[:2], bool)
+    for x, y, w, h in regions:
+        mask[y:y + h, x:x + w] = True
+    return mask
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return 1000 * statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sizes", default="1080p,4K,8K")
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'regions':>8} {'legacy ms':>10} {'blur ms':>8} {'pixelate ms':>12} "
+          f"{'solid ms':>9} {'speedup':>8} {'diff':>6}")
+    for name in args.sizes.split(","):
+        width, height = RESOLUTIONS[name]
+        image, _ = synthetic_corpus_image(width, height)
+        exact = cv2.GaussianBlur(image, blur.BLUR_KERNEL, blur.BLUR_SIGMA)
+        for count in REGION_COUNTS:
+            regions = _regions(width, height, count)
+            legacy = _median_ms(lambda: _legacy(image, regions), args.repeat)
+            timings = {mode: _median_ms(lambda: blur.apply(image, regions, mode), args.repeat)
+                       for mode in blur.MODES}
+            mask = _mask(image.shape, regions)
+            out = blur.apply(image, regions)
+            diff = np.abs(out[mask].astype(np.int16) - exact[mask]).mean()
+            print(f"{name:>6} {count:8} {legacy:10.1f} {timings['blur']:8.1f} {timings['pixelate']:12.1f} "
+                  f"{timings['solid']:9.1f} {legacy / timings['blur']:7.1f}x {diff:6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Throughput of the combined rule matcher versus per-token, per-pattern re.search.
+
+The rule set is padded with extra keyword rules to show how both approaches
+scale as the number of patterns grows. The last table compares one region
+per flagged word (detect) with one per line span (detect_spans) on lines
+that also carry "label: value" secrets and cards split into OCR words.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_detectors
+"""
+import argparse
+import random
+import re
+import time
+
+from core import detectors
+from benchmarks.synthetic import WORDS
+
+
+SPLIT_SECRETS = [["password:", "hunter2"], ["token", "=", "tk_9f8a7b6c"], ["4111", "1111", "1111", "1111"],
+                 ["+1", "(264)", "303-3397"]]
+
+
+def _words(lines: int, seed: int = 0, split_secrets: bool = False) -> list[dict]:
+    rng = random.Random(seed)
+    words = []
+    for line in range(lines):
+        for _ in range(rng.randint(4, 14)):
+            if split_secrets and rng.random() < 0.05:
+                words.extend({"text": text, "line": line} for text in rng.choice(SPLIT_SECRETS))
+                continue
+            words.append({"text": rng.choice(WORDS + ["lorem", "ipsum", "42", "x=1"]), "line": line})
+    return words
+
+
+def _rules(count: int) -> list[detectors.Rule]:
+    extra = [detectors.Rule(f"Keyword{i}", rf'(?i:\bkeyword{i}[a-z]*\b)', needles=(f"keyword{i}",))
+             for i in range(max(0, count - len(detectors.RULES)))]
+    return (detectors.RULES + extra)[:count]
+
+
+def _per_token(words: list[dict], rules: list[detectors.Rule]) -> int:
+    hits = 0
+    for word in words:
+        if any(re.search(rule.pattern, word["text"]) for rule in rules):
+            hits += 1
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=5000)
+    args = parser.parse_args()
+
+    words = _words(args.lines)
+    print(f"{len(words)} words in {args.lines} lines")
+    print(f"{'rules':>6} {'per-token ms':>13} {'combined ms':>12} {'speedup':>8}")
+    for count in (3, 7, 20, 50):
+        rules = _rules(count)
+        start = time.perf_counter()
+        _per_token(words, rules)
+        per_token = time.perf_counter() - start
+        matcher = detectors.Matcher(rules)
+        start = time.perf_counter()
+        detectors.detect(words, matcher)
+        combined = time.perf_counter() - start
+        print(f"{len(rules):6} {1000 * per_token:13.1f} {1000 * combined:12.1f} {per_token / combined:7.1f}x")
+
+    words = _words(args.lines, split_secrets=True)
+    timings, regions = {}, {}
+    for fn in (detectors.detect, detectors.detect_spans):
+        start = time.perf_counter()
+        regions[fn.__name__] = len(fn(words))
+        timings[fn.__name__] = time.perf_counter() - start
+    print(f"\n{'':>13} {'regions':>8} {'ms':>7}")
+    for name in timings:
+        print(f"{name:>13} {regions[name]:8} {1000 * timings[name]:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
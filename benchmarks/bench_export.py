@@ -0,0 +1,79 @@
+"""Saving a sanitized image: the former save path versus core.export.
+
+"before" renders a blurred copy with render_array and calls cv2.imwrite on
+the calling thread, as the preview used to. "after" encodes the already
+composited frame with core.export.write_image on a worker thread while
+the calling thread keeps ticking; "stall" is the longest gap between its
+ticks, i.e. how long a GUI event loop would have been blocked. "extra MB"
+is the peak of NumPy/Python allocations (tracemalloc) beyond the frame.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_export --sizes 4K,8K,60MP
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import cv2
+
+from core import export
+from core.sanitizer import render_array
+from benchmarks.synthetic import RESOLUTIONS, synthetic_corpus_image
+
+SIZES = {**RESOLUTIONS, "60MP": (10240, 5760)}
+
+
+def _before(image, regions, path: str) -> float:
+    start = time.perf_counter()
+    cv2.imwrite(path, render_array(image, regions))
+    return time.perf_counter() - start
+
+
+def _after(frame, path: str) -> tuple[float, float]:
+    worker = threading.Thread(target=export.write_image, args=(frame, path))
+    start = last = time.perf_counter()
+    stall = 0.0
+    worker.start()
+    while worker.is_alive():
+        time.sleep(0.001)
+        now = time.perf_counter()
+        stall = max(stall, now - last)
+        last = now
+    return time.perf_counter() - start, stall
+
+
+def _traced(fn):
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="4K,8K")
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'format':>6} {'before ms':>10} {'extra MB':>9} {'after ms':>9} {'stall ms':>9} "
+          f"{'extra MB':>9} {'before KB':>10} {'after KB':>9}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for name in args.sizes.split(","):
+            image, truth = synthetic_corpus_image(*SIZES[name])
+            regions = [t["rect"] for t in truth]
+            frame = render_array(image, regions)
+            for ext in (".png", ".jpg", ".webp"):
+                old, new = os.path.join(out_dir, "before" + ext), os.path.join(out_dir, "after" + ext)
+                before, before_mb = _traced(lambda: _before(image, regions, old))
+                (after, stall), after_mb = _traced(lambda: _after(frame, new))
+                print(f"{name:>6} {ext[1:]:>6} {1000 * before:10.0f} {before_mb:9.1f} {1000 * after:9.0f} "
+                      f"{1000 * stall:9.1f} {after_mb:9.1f} {os.path.getsize(old) // 1024:10} "
+                      f"{os.path.getsize(new) // 1024:9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Peak RSS and time per snip of the capture -> crop -> render frame path on an 8K desktop.
+
+Compares the former QPixmap round-trip path ("legacy") with the shared
+BGRA/BGR frame path ("frame"). Each path runs in its own subprocess so peak
+RSS is measured independently. OCR is not included.
+
+Run from the repository root (Linux/macOS):
+
+    python -m benchmarks.bench_frame_pipeline --width 7680 --height 4320
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+REGIONS = [(100 + 90 * i, 80 + 40 * i, 160, 30) for i in range(12)]
+
+
+def _legacy_snip(raw: bytes, width: int, height: int, rect):
+    from PyQt6.QtGui import QImage, QPixmap
+
+    img = np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4)
+    img_rgb = np.ascontiguousarray(img[:, :, [2, 1, 0]])
+    qimage = QImage(img_rgb.data, width, height, width * 3, QImage.Format.Format_RGB888)
+    desktop = QPixmap.fromImage(qimage.copy())
+
+    cropped = desktop.copy(*rect)
+    rgba = cropped.toImage().convertToFormat(QImage.Format.Format_RGBA8888)
+    ptr = rgba.bits()
+    ptr.setsize(rgba.height() * rgba.width() * 4)
+    arr = np.frombuffer(ptr, np.uint8).reshape((rgba.height(), rgba.width(), 4))
+    cv_image = cv2.cvtColor(arr, cv2.COLOR_RGBA2BGR)
+
+    result = cv_image.copy()
+    for (x, y, w, h) in REGIONS:
+        roi = result[y:y + h, x:x + w]
+        if roi.size > 0:
+            result[y:y + h, x:x + w] = cv2.GaussianBlur(roi, (51, 51), 30)
+    rgb = cv2.cvtColor(result, cv2.COLOR_BGR2RGB)
+    out = QImage(rgb.data, rgb.shape[1], rgb.shape[0], 3 * rgb.shape[1], QImage.Format.Format_RGB888)
+    return desktop, QPixmap.fromImage(out)
+
+
+def _frame_snip(raw: bytearray, width: int, height: int, rect):
+    from PyQt6.QtGui import QPixmap
+    from core import frame
+    from core.compositor import BlurCompositor
+    from gui.qt_bridge import frame_to_qimage
+
+    desktop_frame = frame.bgra_view(raw, width, height)
+    desktop = QPixmap.fromImage(frame_to_qimage(desktop_frame))
+
+    cv_image = frame.to_bgr(frame.crop(desktop_frame, rect))
+    compositor = BlurCompositor(cv_image)
+    compositor.update(REGIONS)
+    return desktop, QPixmap.fromImage(frame_to_qimage(compositor.frame))
+
+
+def _child(path: str, width: int, height: int, repeat: int):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtGui import QGuiApplication
+
+    app = QGuiApplication([])  # noqa: F841 - QPixmap needs a GUI application
+    # Filled in row chunks so setup does not inflate the peak RSS baseline.
+    raw = bytearray(width * height * 4)
+    rows = np.frombuffer(raw, dtype=np.uint8).reshape(height, width * 4)
+    rng = np.random.default_rng(0)
+    for y in range(0, height, 256):
+        rows[y:y + 256] = rng.integers(0, 255, rows[y:y + 256].shape, dtype=np.uint8)
+    rect = (width // 4, height // 4, width // 3, height // 3)
+    snip = _legacy_snip if path == "legacy" else _frame_snip
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        snip(raw, width, height, rect)
+        samples.append(time.perf_counter() - start)
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"ms": 1000 * sorted(samples)[len(samples) // 2],
+                      "peak_mb": peak_kb / 1024, "extra_mb": (peak_kb - baseline_kb) / 1024}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=7680)
+    parser.add_argument("--height", type=int, default=4320)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--child", choices=["legacy", "frame"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child, args.width, args.height, args.repeat)
+        return
+
+    print(f"{args.width}x{args.height} desktop, selection {args.width // 3}x{args.height // 3}")
+    print(f"{'path':>8} {'ms/snip':>8} {'peak RSS MB':>12} {'over baseline MB':>17}")
+    for path in ("legacy", "frame"):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_frame_pipeline", "--child", path,
+             "--width", str(args.width), "--height", str(args.height), "--repeat", str(args.repeat)],
+            check=True, capture_output=True, text=True).stdout
+        stats = json.loads(out.strip().splitlines()[-1])
+        print(f"{path:>8} {stats['ms']:8.1f} {stats['peak_mb']:12.0f} {stats['extra_mb']:17.0f}")
+
+
+if __name__ == "__main__":
+    main()
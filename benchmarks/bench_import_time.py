@@ -0,0 +1,60 @@
+"""Cold import time of the tray and batch entry points.
+
+Each target is imported in a fresh interpreter; the best wall-clock time of
+--repeat runs is reported together with the heavy modules it pulled in.
+The "eager deps" row imports what core.sanitizer used to load at module
+level, for reference.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_import_time
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+TARGETS = {
+    "core.sanitizer": "import core.sanitizer",
+    "core.cli (batch)": "import core.cli",
+    "gui.snipper": "import gui.snipper",
+    "gui.tray": "import gui.tray",
+    "eager deps": "import cv2, pytesseract, PyQt6.QtGui",
+}
+HEAVY = ("numpy", "cv2", "pytesseract", "PIL", "PyQt6.QtGui")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": 1000 * elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'target':>18} {'best ms':>8}  heavy modules loaded")
+    for name, statement in TARGETS.items():
+        best = None
+        for _ in range(args.repeat):
+            proc = subprocess.run([sys.executable, "-c", PROBE.format(statement=statement, heavy=HEAVY)],
+                                  capture_output=True, text=True)
+            if proc.returncode != 0:
+                # e.g. pynput needs a display server at import time
+                best = {"error": proc.stderr.strip().splitlines()[-1]}
+                break
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            if best is None or result["ms"] < best["ms"]:
+                best = result
+        if "error" in best:
+            print(f"{name:>18} {'n/a':>8}  {best['error']}")
+            continue
+        print(f"{name:>18} {best['ms']:8.1f}  {', '.join(best['loaded']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
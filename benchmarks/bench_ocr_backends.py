@@ -0,0 +1,49 @@
+"""Per-call OCR latency of the resident tesserocr engine versus pytesseract.
+
+Run from the repository root (tesserocr must be installed):
+
+    python -m benchmarks.bench_ocr_backends --repeat 10
+"""
+import argparse
+import statistics
+import time
+
+from core import ocr
+from benchmarks.synthetic import synthetic_screenshot
+
+SIZES = [(400, 120), (1280, 720), (1920, 1080)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    backends = []
+    for name in ocr.BACKENDS:
+        start = time.perf_counter()
+        try:
+            backend = ocr.create_backend(name)
+        except (ImportError, RuntimeError) as exc:
+            print(f"{name}: unavailable ({exc})")
+            continue
+        print(f"{name}: init {1000 * (time.perf_counter() - start):.1f} ms")
+        backends.append(backend)
+
+    print(f"{'size':>10} {'backend':>12} {'median ms':>10} {'p90 ms':>8}")
+    for width, height in SIZES:
+        image, _ = synthetic_screenshot(width, height)
+        for backend in backends:
+            backend.image_to_data(image)
+            samples = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                backend.image_to_data(image)
+                samples.append(1000 * (time.perf_counter() - start))
+            samples.sort()
+            p90 = samples[min(len(samples) - 1, int(len(samples) * 0.9))]
+            print(f"{width}x{height:<5} {backend.name:>12} {statistics.median(samples):10.1f} {p90:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
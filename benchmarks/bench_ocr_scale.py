@@ -0,0 +1,72 @@
+"""OCR time and detection recall with and without adaptive OCR scaling.
+
+The 1080p corpus image is upscaled x1-x4 to simulate the same screen
+captured at increasing HiDPI ratios, and the native 4K/8K corpus images are
+added. Without --ocr only the estimated text height, the chosen scale and
+the pixels handed to Tesseract are printed.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_ocr_scale            # geometry only
+    python -m benchmarks.bench_ocr_scale --ocr      # also run Tesseract
+"""
+import argparse
+import time
+
+import cv2
+
+from core import ocr, textdetect
+from core.sanitizer import analyze_array
+from benchmarks.run import score
+from benchmarks.synthetic import RESOLUTIONS, synthetic_corpus_image
+
+UPSCALES = [1, 2, 3, 4]
+
+
+def _cases():
+    base, truth = synthetic_corpus_image(*RESOLUTIONS["1080p"])
+    for factor in UPSCALES:
+        image = cv2.resize(base, None, fx=factor, fy=factor, interpolation=cv2.INTER_CUBIC)
+        scaled = [{**t, "rect": tuple(v * factor for v in t["rect"])} for t in truth]
+        yield f"1080p x{factor}", image, scaled
+    for name in ("4K", "8K"):
+        image, truth = synthetic_corpus_image(*RESOLUTIONS[name])
+        yield name, image, truth
+
+
+def _analyze(image, truth, adaptive: bool):
+    ocr.settings.adaptive_scale = adaptive
+    start = time.perf_counter()
+    result = analyze_array(image)
+    elapsed = time.perf_counter() - start
+    return elapsed, score(image.shape, truth, result["auto_regions"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ocr", action="store_true", help="time analysis and score recall")
+    args = parser.parse_args()
+
+    header = f"{'case':>11} {'text px':>8} {'scale':>6} {'OCR MPix':>9}"
+    if args.ocr:
+        header += f" {'off ms':>8} {'on ms':>8} {'speedup':>8} {'recall off':>11} {'recall on':>10}"
+    print(header)
+    default = ocr.settings.adaptive_scale
+    for name, image, truth in _cases():
+        gray = ocr.to_gray(image)
+        height = textdetect.estimate_text_height(gray)
+        ocr.settings.adaptive_scale = True
+        scale = ocr.ocr_scale(gray)
+        megapixels = gray.size * scale * scale / 1e6
+        line = f"{name:>11} {height or 0:8.0f} {scale:6.2f} {megapixels:9.1f}"
+        if args.ocr:
+            off_s, off = _analyze(image, truth, adaptive=False)
+            on_s, on = _analyze(image, truth, adaptive=True)
+            line += (f" {1000 * off_s:8.0f} {1000 * on_s:8.0f} {off_s / on_s:7.1f}x"
+                     f" {off['recall']:11.0%} {on['recall']:10.0%}")
+        print(line)
+    ocr.settings.adaptive_scale = default
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Hover hit-testing and repaint cost of the preview canvas with thousands of OCR boxes.
+
+"linear" is the former scan over every box per mouse move; "grid" is
+core.spatial.GridIndex. Repaints compare a full-widget paint with the
+small dirty rectangle a hover change now requests.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_preview_index
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+
+from benchmarks.synthetic import RESOLUTIONS, synthetic_corpus_image
+
+BOX_COUNTS = [1000, 5000, 20000]
+
+
+def _boxes(width: int, height: int, count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    boxes = []
+    for i in range(count):
+        w, h = rng.randint(30, 160), rng.randint(18, 30)
+        boxes.append({"rect": (rng.randint(0, width - w), rng.randint(0, height - h), w, h), "text": f"w{i}"})
+    return boxes
+
+
+def _linear(boxes, x, y):
+    for i, box in enumerate(boxes):
+        bx, by, bw, bh = box["rect"]
+        if bx <= x <= bx + bw and by <= y <= by + bh:
+            return i
+    return None
+
+
+def _median_us(fn, points) -> float:
+    samples = []
+    for x, y in points:
+        start = time.perf_counter()
+        fn(x, y)
+        samples.append(time.perf_counter() - start)
+    return 1e6 * statistics.median(samples)
+
+
+def _paint_ms(canvas, rect, repeat: int) -> float:
+    from PyQt6.QtGui import QPixmap, QRegion
+
+    target = QPixmap(canvas.size())
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        canvas.render(target, sourceRegion=QRegion(rect))
+        samples.append(time.perf_counter() - start)
+    return 1000 * statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="4K", choices=list(RESOLUTIONS))
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtCore import QRect
+    from PyQt6.QtWidgets import QApplication
+    from core.spatial import GridIndex
+    from gui.preview import ImageCanvas
+
+    app = QApplication([])  # noqa: F841 - widgets need an application
+    width, height = RESOLUTIONS[args.size]
+    image, _ = synthetic_corpus_image(width, height)
+    rng = random.Random(1)
+    points = [(rng.randint(0, width), rng.randint(0, height)) for _ in range(2000)]
+
+    print(f"{args.size} image, canvas 1200x800")
+    print(f"{'boxes':>6} {'linear us':>10} {'grid us':>8} {'full paint ms':>14} {'dirty paint ms':>15}")
+    for count in BOX_COUNTS:
+        boxes = _boxes(width, height, count)
+        index = GridIndex()
+        for i, box in enumerate(boxes):
+            index.insert(i, box["rect"])
+        linear = _median_us(lambda x, y: _linear(boxes, x, y), points)
+        grid = _median_us(lambda x, y: min(index.at(x, y), default=None), points)
+
+        regions = [box["rect"] for box in boxes[:count // 10]]
+        canvas = ImageCanvas(image, boxes, regions)
+        canvas.resize(1200, 800)
+        full = _paint_ms(canvas, canvas.rect(), args.repeat)
+        dirty = _paint_ms(canvas, QRect(400, 300, 60, 24), args.repeat)
+        print(f"{count:6} {linear:10.1f} {grid:8.1f} {full:14.2f} {dirty:15.2f}")
+
+
+if __name__ == "__main__":
+    main()
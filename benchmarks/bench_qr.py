@@ -0,0 +1,112 @@
+"""Per-stage timing of QR/barcode detection versus the former detect-and-decode call.
+
+The legacy stage built a new QRCodeDetector and ran detectAndDecodeMulti on
+the full-resolution BGR image. The current stage (core.qr) converts to gray
+and searches it at full resolution with reused detectors, without decoding. "found" counts the planted QR
+codes that were located. With --ocr, OCR followed by code detection is
+compared with analyze_array, which overlaps the two (needs tesseract).
+
+Run from the repository root:
+
+    python -m benchmarks.bench_qr --repeat 5
+"""
+import argparse
+import statistics
+import time
+
+import cv2
+import numpy as np
+
+from core import qr
+from benchmarks.synthetic import synthetic_screenshot
+
+SIZES = [(1920, 1080), (3840, 2160), (5120, 2880), (7680, 4320)]
+# Module sizes in pixels of the planted codes.
+MODULES = [3, 4, 6, 8]
+
+
+def _plant_codes(img) -> list[tuple[int, int, int, int]]:
+    encoder = cv2.QRCodeEncoder.create()
+    h_img = img.shape[0]
+    rects = []
+    for i, px in enumerate(MODULES):
+        code = encoder.encode(f"https://example.com/reset?token={i:04d}")
+        code = cv2.resize(code, None, fx=px, fy=px, interpolation=cv2.INTER_NEAREST)
+        code = cv2.copyMakeBorder(code, 4 * px, 4 * px, 4 * px, 4 * px, cv2.BORDER_CONSTANT, value=255)
+        side = code.shape[0]
+        x, y = 100 + 400 * i, h_img - side - 50
+        img[y:y + side, x:x + side] = code[..., None]
+        rects.append((x, y, side, side))
+    return rects
+
+
+def _legacy(img):
+    detector = cv2.QRCodeDetector()
+    retval, _decoded, points, _ = detector.detectAndDecodeMulti(img)
+    if not retval or points is None:
+        return []
+    return [qr._bounds(np.asarray(p, dtype=np.float32), img.shape[1], img.shape[0], qr.QR_PAD)
+            for p in points]
+
+
+def _found(planted, regions) -> int:
+    def covers(region, rect):
+        return (region[0] <= rect[0] + rect[2] // 2 <= region[0] + region[2]
+                and region[1] <= rect[1] + rect[3] // 2 <= region[1] + region[3])
+    return sum(any(covers(r, rect) for r in regions) for rect in planted)
+
+
+def _median_ms(fn, repeat: int):
+    result = fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return 1000 * statistics.median(samples), result
+
+
+def _stages(img, repeat: int) -> dict[str, float]:
+    detector, barcode = qr._detectors()
+    gray_ms, gray = _median_ms(lambda: qr._to_gray(img), repeat)
+    search_ms, _ = _median_ms(lambda: qr._find(detector, gray), repeat)
+    barcode_ms, _ = _median_ms(lambda: qr._find(barcode, gray), repeat)
+    return {"gray": gray_ms, "search": search_ms, "barcode": barcode_ms}
+
+
+def _overlap(img, repeat: int):
+    from core import ocr, sanitizer
+
+    def sequential():
+        ocr.image_to_data(img)
+        qr.detect_codes(img)
+
+    seq_ms, _ = _median_ms(sequential, repeat)
+    par_ms, _ = _median_ms(lambda: sanitizer.analyze_array(img), repeat)
+    print(f"{'':>10} OCR then codes {seq_ms:8.1f} ms, analyze_array {par_ms:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--ocr", action="store_true", help="also time OCR overlap")
+    args = parser.parse_args()
+
+    print(f"{'size':>10} {'stage':>9} {'median ms':>10} {'found':>6}")
+    for width, height in SIZES:
+        img, _ = synthetic_screenshot(width, height)
+        planted = _plant_codes(img)
+        size = f"{width}x{height}"
+        legacy_ms, legacy = _median_ms(lambda: _legacy(img), args.repeat)
+        print(f"{size:>10} {'legacy':>9} {legacy_ms:10.1f} {_found(planted, legacy):>4}/{len(planted)}")
+        for stage, ms in _stages(img, args.repeat).items():
+            print(f"{'':>10} {stage:>9} {ms:10.1f}")
+        total_ms, regions = _median_ms(lambda: qr.detect_codes(img), args.repeat)
+        found = _found(planted, [rect for kind, rect in regions if kind == "QR"])
+        print(f"{'':>10} {'total':>9} {total_ms:10.1f} {found:>4}/{len(planted)}")
+        if args.ocr:
+            _overlap(img, max(1, args.repeat // 2))
+
+
+if __name__ == "__main__":
+    main()
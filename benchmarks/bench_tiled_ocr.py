@@ -0,0 +1,49 @@
+"""Wall-clock comparison of single-call and tiled OCR on multi-monitor-sized images.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_tiled_ocr --repeat 3
+"""
+import argparse
+import time
+
+from core import ocr
+from benchmarks.synthetic import synthetic_screenshot
+
+SIZES = [(3840, 1080), (5760, 1080), (7680, 2160), (11520, 2160)]
+
+
+def _time(fn, image, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    words = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = fn(image)
+        best = min(best, time.perf_counter() - start)
+        words = sum(1 for t in data["text"] if str(t).strip())
+    return best, words
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=ocr.settings.workers)
+    parser.add_argument("--tile-height", type=int, default=None)
+    args = parser.parse_args()
+
+    # Warm the process pool so spawn cost is not attributed to the first size.
+    ocr.ocr_tiled(synthetic_screenshot(640, 1200)[0], workers=args.workers)
+
+    print(f"{'size':>12} {'single s':>9} {'tiled s':>9} {'speedup':>8} {'words':>13}")
+    for width, height in SIZES:
+        image, _ = synthetic_screenshot(width, height)
+        single, single_words = _time(ocr.ocr_single, image, args.repeat)
+        tiled, tiled_words = _time(
+            lambda img: ocr.ocr_tiled(img, tile_height=args.tile_height, workers=args.workers),
+            image, args.repeat)
+        print(f"{width}x{height:<7} {single:9.2f} {tiled:9.2f} {single / tiled:7.2f}x "
+              f"{single_words:>6}/{tiled_words:<6}")
+
+
+if __name__ == "__main__":
+    main()
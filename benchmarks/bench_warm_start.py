@@ -0,0 +1,86 @@
+"""First-snip latency of a cold tray process versus one that ran warm_up().
+
+Each variant runs in a fresh interpreter with an offscreen Qt platform and
+times the first call of every stage a snip goes through on a 1080p corpus
+image; the image is loaded with NumPy alone so the cold process has not
+imported OpenCV yet. "overlay" is building the selection window (cold: a new
+SnippingWidget per press, as before) versus showing the pre-built one.
+Stages that fail here (e.g. OCR without a Tesseract install) are shown as
+n/a.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_warm_start
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_corpus_image
+
+PROBE = """
+import json, time
+import numpy as np
+from PyQt6.QtWidgets import QApplication
+app = QApplication([])
+image = np.load({image_path!r})
+timings = {{}}
+
+def timed(name, fn):
+    start = time.perf_counter()
+    try:
+        fn()
+    except Exception as exc:
+        timings[name] = type(exc).__name__
+        return
+    timings[name] = 1000 * (time.perf_counter() - start)
+
+from gui.snipper import SnippingWidget
+if {warm}:
+    from core.sanitizer import warm_up
+    warm_start = time.perf_counter()
+    warm_up()
+    snipper = SnippingWidget()
+    timings["warm_up (at startup)"] = 1000 * (time.perf_counter() - warm_start)
+    timed("overlay", lambda: (snipper.show(), snipper.hide()))
+else:
+    timed("overlay", lambda: SnippingWidget().show())
+
+from core import ocr, qr, sanitizer
+# Analysis detects codes on its own pool, whose threads warm_up() primed.
+timed("codes", lambda: sanitizer._code_pool.submit(qr.detect_codes, image).result())
+timed("blur", lambda: sanitizer.render_array(image, [(100, 100, 400, 40)]))
+timed("ocr", lambda: ocr.image_to_data(image))
+print(json.dumps(timings))
+"""
+
+
+def _run(warm: bool, image_path: str) -> dict:
+    env = {**os.environ, "QT_QPA_PLATFORM": "offscreen"}
+    probe = PROBE.format(warm=warm, image_path=image_path)
+    proc = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, env=env)
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _cell(value) -> str:
+    return f"{value:10.1f}" if isinstance(value, float) else f"{'n/a':>10}"
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        image_path = os.path.join(tmp, "image.npy")
+        np.save(image_path, synthetic_corpus_image(1920, 1080)[0])
+        cold, warm = _run(False, image_path), _run(True, image_path)
+    print(f"{'stage':>22} {'cold ms':>10} {'warm ms':>10}")
+    for name in list(cold) + [n for n in warm if n not in cold]:
+        print(f"{name:>22} {_cell(cold.get(name))} {_cell(warm.get(name))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Sanitizer throughput and detection recall/precision on the synthetic corpus.
+
+Each resolution gets one image from benchmarks.synthetic.synthetic_corpus_image
+with seeded secrets and QR codes. analyze_image is timed end to end and its
+regions are scored against the ground truth. apply_blur_regions,
+render_image and save_clean are timed on the ground-truth regions so their
+numbers do not depend on what the analysis found.
+
+A secret counts as recalled when at least half of its box is covered by
+detected regions. A detected region counts as correct when at least a third
+of it lies on seeded secrets.
+
+Run from the repository root (analysis needs tesseract):
+
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 1080p,4K --repeat 5 --json results.json
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import RESOLUTIONS, synthetic_corpus_image
+
+RECALL_COVERAGE = 0.5
+PRECISION_OVERLAP = 1 / 3
+
+
+def _mask(shape, rects) -> np.ndarray:
+    mask = np.zeros(shape[:2], bool)
+    for x, y, w, h in rects:
+        mask[max(0, y):y + h, max(0, x):x + w] = True
+    return mask
+
+
+def _fraction(mask: np.ndarray, rect) -> float:
+    x, y, w, h = rect
+    area = mask[max(0, y):y + h, max(0, x):x + w]
+    return float(area.mean()) if area.size else 0.0
+
+
+def score(shape, truth: list[dict], regions: list[tuple]) -> dict:
+    """Recall per kind and overall precision of ``regions`` against ``truth``."""
+    detected = _mask(shape, regions)
+    seeded = _mask(shape, [t["rect"] for t in truth])
+    kinds: dict[str, list[bool]] = {}
+    for t in truth:
+        kinds.setdefault(t["kind"], []).append(_fraction(detected, t["rect"]) >= RECALL_COVERAGE)
+    recalled = sum(sum(hits) for hits in kinds.values())
+    correct = sum(_fraction(seeded, rect) >= PRECISION_OVERLAP for rect in regions)
+    return {
+        "recall": recalled / len(truth) if truth else 1.0,
+        "precision": correct / len(regions) if regions else 1.0,
+        "regions": len(regions),
+        "by_kind": {kind: f"{sum(hits)}/{len(hits)}" for kind, hits in sorted(kinds.items())},
+    }
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def run_size(name: str, repeat: int, seed: int, analyze: bool, out_dir: str) -> dict:
+    from core.sanitizer import apply_blur_regions, save_clean
+    from gui.qt_bridge import analyze_image, cv_image_to_qpixmap, render_image
+
+    width, height = RESOLUTIONS[name]
+    image, truth = synthetic_corpus_image(width, height, seed)
+    truth_regions = [t["rect"] for t in truth]
+    megapixels = width * height / 1e6
+    record = {"size": name, "width": width, "height": height, "secrets": len(truth), "timings": {}}
+
+    ops = {
+        "apply_blur_regions": lambda: apply_blur_regions(image, truth_regions),
+        "render_image": lambda: render_image(image, truth_regions),
+        "save_clean.png": lambda: save_clean(image, truth_regions, os.path.join(out_dir, "out.png")),
+        "save_clean.jpg": lambda: save_clean(image, truth_regions, os.path.join(out_dir, "out.jpg")),
+    }
+    if analyze:
+        pixmap = cv_image_to_qpixmap(image)
+        try:
+            result = analyze_image(pixmap)
+        except Exception as exc:
+            record["analyze_error"] = str(exc)
+        else:
+            record["detection"] = score(image.shape, truth, result["auto_regions"])
+            ops = {"analyze_image": lambda: analyze_image(pixmap), **ops}
+
+    for op, fn in ops.items():
+        seconds = _time(fn, repeat)
+        record["timings"][op] = {"ms": 1000 * seconds, "mpix_per_s": megapixels / seconds}
+    return record
+
+
+def _print(record: dict):
+    print(f"{record['size']} ({record['width']}x{record['height']}), {record['secrets']} seeded secrets")
+    for op, timing in record["timings"].items():
+        print(f"  {op:<20} {timing['ms']:10.1f} ms {timing['mpix_per_s']:8.1f} MPix/s")
+    if "analyze_error" in record:
+        print(f"  analyze_image unavailable: {record['analyze_error']}")
+    detection = record.get("detection")
+    if detection:
+        kinds = " ".join(f"{kind} {hits}" for kind, hits in detection["by_kind"].items())
+        print(f"  recall {detection['recall']:.0%}  precision {detection['precision']:.0%}  "
+              f"({detection['regions']} regions)  {kinds}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(RESOLUTIONS),
+                        help=f"comma-separated subset of {', '.join(RESOLUTIONS)}")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-analyze", action="store_true", help="only time blur, render and save")
+    parser.add_argument("--json", metavar="PATH", help="write the results to PATH")
+    args = parser.parse_args()
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in RESOLUTIONS]
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(unknown)}")
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtGui import QGuiApplication
+
+    app = QGuiApplication([])  # noqa: F841 - QPixmap needs a GUI application
+    records = []
+    with tempfile.TemporaryDirectory() as out_dir:
+        for name in sizes:
+            record = run_size(name, args.repeat, args.seed, not args.no_analyze, out_dir)
+            _print(record)
+            records.append(record)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"seed": args.seed, "repeat": args.repeat, "results": records}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Synthetic screenshot generator shared by the benchmarks."""
+import random
+
+import cv2
+import numpy as np
+
+WORDS = ["build", "server", "deploy", "admin@example.com", "10.0.12.7", "password",
+         "release", "token", "config", "staging", "monitor", "cluster"]
+
+
+def _draw_text_lines(img, boxes, rng, x0, y0, x1, y1, color, scale):
+    thickness = 1 if scale < 0.6 else 2
+    line_h = int(34 * scale) + rng.randint(8, 20)
+    y = y0 + line_h
+    while y < y1 - 8:
+        x = x0 + rng.randint(8, 40)
+        while True:
+            text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5)))
+            (tw, th), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+            if x + tw >= x1 - 8:
+                break
+            cv2.putText(img, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness, cv2.LINE_AA)
+            boxes.append((x, y - th, tw, th + baseline))
+            x += tw + rng.randint(60, 400)
+        y += line_h
+
+
+def synthetic_screenshot(width: int, height: int, seed: int = 0):
+    """Render an IDE/browser-like screenshot.
+
+    Returns the BGR image and the (x, y, w, h) box of every rendered text run.
+    The layout has a dark sidebar, a light content pane with window borders,
+    a photo-like noise panel and large empty areas.
+    """
+    rng = random.Random(seed)
+    img = np.full((height, width, 3), 245, np.uint8)
+    boxes: list[tuple[int, int, int, int]] = []
+
+    sidebar_w = min(360, width // 5)
+    img[:, :sidebar_w] = (40, 38, 36)
+    _draw_text_lines(img, boxes, rng, 0, 0, sidebar_w, height // 2, (200, 200, 200), 0.5)
+
+    cv2.rectangle(img, (sidebar_w + 20, 20), (width - 20, height - 20), (180, 180, 180), 1)
+    content_w = width - sidebar_w
+    _draw_text_lines(img, boxes, rng, sidebar_w + 20, 20, sidebar_w + content_w // 2, height - 20,
+                     (30, 30, 30), 0.7)
+
+    photo_x = sidebar_w + content_w // 2 + 40
+    photo_h = min(height - 80, 600)
+    noise = np.random.default_rng(seed).integers(0, 255, (photo_h, width - 60 - photo_x, 3), dtype=np.uint8)
+    img[40:40 + photo_h, photo_x:width - 60] = cv2.GaussianBlur(noise, (5, 5), 1.5)
+    return img, boxes
+
+
+# Words no detection rule should fire on.
+FILLER = ["build", "server", "deploy", "release", "config", "staging", "monitor", "cluster",
+          "status", "running", "branch", "commit", "review", "update", "service", "latency",
+          "request", "cache", "worker", "queue", "metrics", "version", "report", "module"]
+
+RESOLUTIONS = {
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4K": (3840, 2160),
+    "5K": (5120, 2880),
+    "8K": (7680, 4320),
+}
+
+
+def _luhn_card(rng) -> str:
+    digits = [4] + [rng.randint(0, 9) for _ in range(14)]
+    total = 0
+    for i, digit in enumerate(reversed(digits)):
+        if i % 2 == 0:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    digits.append((10 - total % 10) % 10)
+    text = "".join(map(str, digits))
+    return " ".join(text[i:i + 4] for i in range(0, 16, 4))
+
+
+def _token(rng, alphabet: str, length: int) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+_B64URL = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+
+SECRETS = {
+    "Email": lambda rng: f"{rng.choice(['anna', 'ivan', 'ops', 'billing'])}.{_token(rng, 'abcdefgh', 5)}"
+                         f"@{rng.choice(['example', 'corp-mail', 'acme'])}.com",
+    "IP": lambda rng: ".".join(str(rng.randint(1, 254)) for _ in range(4)),
+    "Secret": lambda rng: _token(rng, _B64URL, rng.randint(10, 16)),
+    "JWT": lambda rng: "eyJ" + ".".join(_token(rng, _B64URL, n) for n in (12, 18, 14)),
+    "AWSKey": lambda rng: "AKIA" + _token(rng, "ABCDEFGHIJKLMNOPQRSTUVWXYZ234567", 16),
+    "Card": _luhn_card,
+    "Phone": lambda rng: f"+1 ({rng.randint(201, 989)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+}
+
+
+# Kinds drawn as "label value"; only the value is ground truth.
+LABELS = {
+    "Secret": lambda rng: rng.choice(["password:", "token:", "secret:", "api_key ="]),
+}
+
+
+def _put_run(img, text: str, x: int, y: int, color, scale: float) -> tuple[int, int, int, int]:
+    thickness = 1 if scale < 0.6 else 2
+    (tw, th), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+    cv2.putText(img, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness, cv2.LINE_AA)
+    return x, y - th, tw, th + baseline
+
+
+def _put_qr(img, rng, x: int, y: int, module: int) -> tuple[int, int, int, int]:
+    code = cv2.QRCodeEncoder.create().encode(f"otpauth://totp/blurveil?secret={_token(rng, _B64URL, 16)}")
+    code = cv2.resize(code, None, fx=module, fy=module, interpolation=cv2.INTER_NEAREST)
+    code = cv2.copyMakeBorder(code, 4 * module, 4 * module, 4 * module, 4 * module,
+                              cv2.BORDER_CONSTANT, value=255)
+    side = code.shape[0]
+    img[y:y + side, x:x + side] = code[..., None]
+    return x, y, side, side
+
+
+def synthetic_corpus_image(width: int, height: int, seed: int = 0, secret_rate: float = 0.35):
+    """Render a screenshot with seeded sensitive data and its ground truth.
+
+    Text and QR modules scale with the resolution like a HiDPI desktop
+    (x2 at 4K, x4 at 8K). Lines are filler words; ``secret_rate`` of them
+    carry one secret from SECRETS. Returns the BGR image and a list of
+    {"kind", "rect", "text"} dicts, one per seeded secret or QR code.
+    """
+    rng = random.Random(seed)
+    ui = max(1, height // 1080)
+    img = np.full((height, width, 3), 245, np.uint8)
+    truth: list[dict] = []
+
+    sidebar_w = min(360 * ui, width // 5)
+    img[:, :sidebar_w] = (40, 38, 36)
+    y = 40 * ui
+    while y < height // 2:
+        _put_run(img, " ".join(rng.choice(FILLER) for _ in range(2)), 16 * ui, y, (200, 200, 200), 0.5 * ui)
+        y += 30 * ui
+
+    x0, x1 = sidebar_w + 40 * ui, width - 40 * ui
+    qr_column = x1 - 320 * ui
+    scale = 0.8 * ui
+    line_h = 44 * ui
+    kinds = list(SECRETS)
+    y = 60 * ui
+    while y < height - 30 * ui:
+        x = x0 + rng.randint(0, 30) * ui
+        has_secret = rng.random() < secret_rate
+        slot = rng.randint(1, 4) if has_secret else -1
+        for i in range(6):
+            kind = rng.choice(kinds) if i == slot else None
+            label = LABELS[kind](rng) + " " if kind in LABELS else ""
+            text = SECRETS[kind](rng) if kind else rng.choice(FILLER)
+            (lw, _), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, scale, 2)
+            (tw, _), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, 2)
+            if x + lw + tw >= qr_column - 20 * ui:
+                break
+            if label:
+                _put_run(img, label, x, y, (30, 30, 30), scale)
+                x += lw
+            rect = _put_run(img, text, x, y, (30, 30, 30), scale)
+            if kind:
+                truth.append({"kind": kind, "rect": rect, "text": text})
+            x += tw + 24 * ui
+        y += line_h
+
+    y = 60 * ui
+    for module in (3, 4, 6):
+        module *= ui
+        if y + 41 * module > height:
+            break
+        rect = _put_qr(img, rng, qr_column, y, module)
+        truth.append({"kind": "QR", "rect": rect, "text": ""})
+        y += rect[3] + 40 * ui
+    return img, truth
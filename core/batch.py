@@ -0,0 +1,115 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterator
+
+from core import export, ocr
+from core.sanitizer import analyze_array, save_clean
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp", ".webp", ".tif", ".tiff"}
+
+
+def _is_image(path: Path) -> bool:
+    return path.is_file() and path.suffix.lower() in IMAGE_SUFFIXES
+
+
+def _glob_root(spec: str) -> Path:
+    """The leading part of a glob pattern that has no wildcards in it."""
+    parts = []
+    for part in Path(spec).parts:
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return Path(*parts)
+
+
+def iter_inputs(specs: list[str], recursive: bool = False) -> Iterator[tuple[Path, Path]]:
+    """Expand files, directories and glob patterns into (path, relative path) pairs.
+
+    The relative path is used to mirror directory and glob inputs under an
+    output directory; for a glob it is taken from the pattern's first
+    wildcard on, so "in/**/*.png" keeps the subdirectories below in/.
+    Each file is yielded once.
+    """
+    seen = set()
+    for spec in specs:
+        root = Path(spec)
+        if root.is_dir():
+            candidates = root.rglob("*") if recursive else root.iterdir()
+            pairs = ((p, p.relative_to(root)) for p in sorted(candidates))
+        elif root.is_file():
+            pairs = [(root, Path(root.name))]
+        else:
+            base = _glob_root(spec)
+            pairs = ((Path(p), Path(os.path.relpath(p, base))) for p in sorted(glob.glob(spec, recursive=True)))
+        for path, rel in pairs:
+            key = path.resolve()
+            if key not in seen and _is_image(path):
+                seen.add(key)
+                yield path, rel
+
+
+def output_path(path: Path, rel: Path, output_dir: str | None, suffix: str, ext: str | None = None) -> Path:
+    parent = Path(output_dir) / rel.parent if output_dir else path.parent
+    return parent / f"{path.stem}{suffix}{ext or path.suffix}"
+
+
+def unique_path(path: Path, taken: set[str]) -> Path:
+    """``path``, or ``<stem>_2``, ``<stem>_3``... when it is already in ``taken``; records the result.
+
+    Keeps two jobs of one batch from writing the same file, e.g. inputs
+    with the same name from different directories.
+    """
+    candidate, n = path, 1
+    while os.path.normcase(os.path.abspath(candidate)) in taken:
+        n += 1
+        candidate = path.with_name(f"{path.stem}_{n}{path.suffix}")
+    taken.add(os.path.normcase(os.path.abspath(candidate)))
+    return candidate
+
+
+def sanitize_file(src: str, dst: str, mode: str = "blur", quality: int | None = None,
+                  compression: int = export.PNG_COMPRESSION) -> dict:
+    import cv2
+
+    image = cv2.imread(src, cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError(f"cannot read image: {src}")
+    result = analyze_array(image)
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    if not save_clean(image, result["auto_regions"], dst, mode, quality, compression):
+        raise OSError(f"cannot write image: {dst}")
+    return {
+        "input": src,
+        "output": dst,
+        "width": image.shape[1],
+        "height": image.shape[0],
+        "regions": [{"rect": list(d["rect"]), "rule": d["rule"]} for d in result["detections"]],
+    }
+
+
+def _init_worker():
+    # Parallelism comes from processing several images at once.
+    ocr.settings.tiled = False
+
+
+def _safe_sanitize(src: str, dst: str, *options) -> dict:
+    try:
+        return sanitize_file(src, dst, *options)
+    except Exception as exc:
+        return {"input": src, "output": dst, "error": str(exc)}
+
+
+def run_batch(jobs: list[tuple[str, str]], workers: int, mode: str = "blur", quality: int | None = None,
+              compression: int = export.PNG_COMPRESSION) -> Iterator[dict]:
+    """Sanitize (src, dst) pairs and yield one report entry per image as it finishes."""
+    options = (mode, quality, compression)
+    if workers <= 1:
+        for src, dst in jobs:
+            yield _safe_sanitize(src, dst, *options)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(_safe_sanitize, src, dst, *options) for src, dst in jobs]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+CACHED_KEYS = ("ocr_boxes", "auto_regions", "detections")
+
+
+def image_key(image) -> str:
+    """Exact content hash of an image array, including its shape."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((image.shape, image.dtype.str)).encode())
+    digest.update(memoryview(image if image.flags.c_contiguous else image.copy()).cast("B"))
+    return digest.hexdigest()
+
+
+def _copy(result: dict) -> dict:
+    return {name: list(result[name]) for name in CACHED_KEYS}
+
+
+def _estimate_size(result: dict) -> int:
+    size = 256
+    size += sum(160 + len(box["text"]) for box in result["ocr_boxes"])
+    size += 96 * len(result["auto_regions"]) + 160 * len(result["detections"])
+    return size
+
+
+def _clip(rect, crop) -> tuple | None:
+    x0, y0 = max(rect[0], crop[0]), max(rect[1], crop[1])
+    x1 = min(rect[0] + rect[2], crop[0] + crop[2])
+    y1 = min(rect[1] + rect[3], crop[1] + crop[3])
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return x0 - crop[0], y0 - crop[1], x1 - x0, y1 - y0
+
+
+def crop_result(result: dict, rect: tuple[int, int, int, int]) -> dict:
+    """Translate a full-frame result into the coordinates of a sub-rectangle.
+
+    Boxes cut by the crop edge are kept and clipped, so a partly visible
+    secret is still blurred.
+    """
+    ocr_boxes = []
+    for box in result["ocr_boxes"]:
+        clipped = _clip(box["rect"], rect)
+        if clipped:
+            ocr_boxes.append({"rect": clipped, "text": box["text"]})
+    detections = []
+    for det in result["detections"]:
+        clipped = _clip(det["rect"], rect)
+        if clipped:
+            detections.append({"rect": clipped, "rule": det["rule"]})
+    return {
+        "ocr_boxes": ocr_boxes,
+        "auto_regions": [d["rect"] for d in detections],
+        "detections": detections,
+    }
+
+
+def _to_json(result: dict) -> dict:
+    return {
+        "ocr_boxes": [{"rect": list(b["rect"]), "text": b["text"]} for b in result["ocr_boxes"]],
+        "detections": [{"rect": list(d["rect"]), "rule": d["rule"]} for d in result["detections"]],
+    }
+
+
+def _from_json(data: dict) -> dict:
+    detections = [{"rect": tuple(d["rect"]), "rule": d["rule"]} for d in data["detections"]]
+    return {
+        "ocr_boxes": [{"rect": tuple(b["rect"]), "text": b["text"]} for b in data["ocr_boxes"]],
+        "auto_regions": [d["rect"] for d in detections],
+        "detections": detections,
+    }
+
+
+class AnalysisCache:
+    """LRU cache of analysis results keyed by image content hash.
+
+    The in-memory store is bounded by an estimate of the results' size.
+    Results of whole frames can also be stored with put_frame, so that a
+    later crop of the same frame is answered by translating coordinates.
+    With disk_dir set, results are also written there as JSON (owner-only
+    permissions, since they contain OCR'd text).
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, disk_dir: str | None = None,
+                 max_disk_entries: int = 2000):
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.max_disk_entries = max_disk_entries
+        self._entries: OrderedDict[str, tuple[dict, int]] = OrderedDict()
+        self._frames: set[str] = set()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.crop_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _store(self, key: str, result: dict):
+        result = _copy(result)
+        size = _estimate_size(result)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (result, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            old_key, (_, old_size) = self._entries.popitem(last=False)
+            self._frames.discard(old_key)
+            self._bytes -= old_size
+            self.evictions += 1
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy(entry[0])
+        result = self._read_disk(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, result)
+            return _copy(result)
+
+    def put(self, key: str, result: dict):
+        with self._lock:
+            self._store(key, result)
+        self._write_disk(key, result)
+
+    @property
+    def has_frames(self) -> bool:
+        return bool(self._frames)
+
+    def put_frame(self, key: str, result: dict):
+        with self._lock:
+            self._store(key, result)
+            if key in self._entries:
+                self._frames.add(key)
+
+    def get_crop(self, frame_key: str, rect: tuple[int, int, int, int]) -> dict | None:
+        with self._lock:
+            if frame_key not in self._frames:
+                return None
+            self._entries.move_to_end(frame_key)
+            self.crop_hits += 1
+            return crop_result(self._entries[frame_key][0], rect)
+
+    def stats(self) -> dict:
+        with self._lock:
+            served = self.hits + self.disk_hits + self.crop_hits
+            lookups = served + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "crop_hits": self.crop_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": served / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._frames.clear()
+            self._bytes = 0
+
+    def _read_disk(self, key: str) -> dict | None:
+        if self.disk_dir is None:
+            return None
+        try:
+            with open(self.disk_dir / f"{key}.json", encoding="utf-8") as f:
+                return _from_json(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, key: str, result: dict):
+        if self.disk_dir is None:
+            return
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+            path = self.disk_dir / f"{key}.json"
+            tmp = path.with_suffix(".tmp")
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(_to_json(result), f, ensure_ascii=False)
+            os.replace(tmp, path)
+            self._prune_disk()
+        except OSError:
+            pass
+
+    def _prune_disk(self):
+        files = sorted(self.disk_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for path in files[:max(0, len(files) - self.max_disk_entries)]:
+            path.unlink(missing_ok=True)
+
+
+default_cache = AnalysisCache(disk_dir=os.environ.get("BLURVEIL_CACHE_DIR"))
@@ -0,0 +1,73 @@
+import argparse
+import json
+import os
+import sys
+
+from core import remote
+from core.batch import iter_inputs, output_path, run_batch, unique_path
+from core.blur import MODES
+from core.export import PNG_COMPRESSION
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="blurveil", description="Blur sensitive data in screenshots without starting the GUI.")
+    parser.add_argument("inputs", nargs="+", help="image files, directories or glob patterns")
+    parser.add_argument("-o", "--output-dir", help="write results here instead of next to the inputs")
+    parser.add_argument("--suffix", default="_clean", help="file name suffix of the results (default: _clean)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="descend into subdirectories")
+    parser.add_argument("--mode", choices=MODES, default="blur", help="how regions are obscured (default: blur)")
+    parser.add_argument("--format", choices=["png", "jpg", "webp"],
+                        help="output format (default: the format of each input)")
+    parser.add_argument("--quality", type=int, choices=range(1, 101), metavar="1-100",
+                        help="JPEG/WebP quality (default: 95 for JPEG, 90 for WebP)")
+    parser.add_argument("--png-compression", type=int, choices=range(10), metavar="0-9", default=PNG_COMPRESSION,
+                        help=f"PNG zlib level (default: {PNG_COMPRESSION})")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--remote", action="store_true",
+                        help="hand the images to the running Blurveil tray app instead of starting workers")
+    parser.add_argument("--report", metavar="PATH", help="write a JSON report of found regions ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    ext = f".{args.format}" if args.format else None
+    jobs = []
+    taken: set[str] = set()
+    for path, rel in iter_inputs(args.inputs, args.recursive):
+        if not args.output_dir and path.stem.endswith(args.suffix):
+            continue
+        dst = unique_path(output_path(path, rel, args.output_dir, args.suffix, ext), taken)
+        jobs.append((str(path), str(dst)))
+    if not jobs:
+        parser.error("no images found")
+
+    if args.remote:
+        results = remote.submit(jobs, args.mode, args.quality, args.png_compression)
+    else:
+        results = run_batch(jobs, args.jobs, args.mode, args.quality, args.png_compression)
+    entries = []
+    failed = 0
+    try:
+        for done, entry in enumerate(results, 1):
+            if "error" in entry:
+                failed += 1
+                status = f"error: {entry['error']}"
+            else:
+                status = f"{len(entry['regions'])} regions -> {entry['output']}"
+            print(f"[{done}/{len(jobs)}] {entry['input']}: {status}", file=sys.stderr, flush=True)
+            entries.append(entry)
+    except remote.RemoteUnavailable as exc:
+        print(f"blurveil: {exc}", file=sys.stderr)
+        return 2
+
+    if args.report:
+        report = json.dumps({"images": entries}, indent=2, ensure_ascii=False)
+        if args.report == "-":
+            print(report)
+        else:
+            with open(args.report, "w", encoding="utf-8") as f:
+                f.write(report + "\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+from collections import Counter
+
+from core import blur
+
+
+def _intersect(a: tuple, b: tuple) -> tuple | None:
+    x0, y0 = max(a[0], b[0]), max(a[1], b[1])
+    x1, y1 = min(a[0] + a[2], b[0] + b[2]), min(a[1] + a[3], b[1] + b[3])
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return x0, y0, x1 - x0, y1 - y0
+
+
+class BlurCompositor:
+    """Keeps a composited BGR frame in sync with a changing list of blur regions.
+
+    The source is obscured once (see core.blur.obscured), on the first region.
+    Each update only touches the rectangles that were added or removed: they
+    are restored from the source and the obscured pixels of every active
+    region overlapping them are copied back in.
+    """
+
+    def __init__(self, image, mode: str = "blur"):
+        self.source = image
+        self.frame = image.copy()
+        self.mode = mode
+        self._blurred = None
+        self._regions: list[tuple] = []
+
+    @property
+    def blurred(self):
+        if self._blurred is None:
+            self._blurred = blur.obscured(self.source, self.mode)
+        return self._blurred
+
+    def set_mode(self, mode: str) -> list[tuple]:
+        """Switch the effect and return the dirty rectangles (every active region)."""
+        if mode not in blur.MODES:
+            raise ValueError(f"unknown mode: {mode}")
+        if mode == self.mode:
+            return []
+        self.mode = mode
+        self._blurred = None
+        regions, self._regions = self._regions, []
+        return self.update(regions)
+
+    def update(self, regions: list[tuple]) -> list[tuple]:
+        """Apply the new region list and return the dirty (x, y, w, h) rectangles."""
+        old, new = Counter(self._regions), Counter(regions)
+        self._regions = list(regions)
+        bounds = (0, 0, self.source.shape[1], self.source.shape[0])
+        dirty = []
+        for rect in (old - new) + (new - old):
+            clipped = _intersect(rect, bounds)
+            if clipped:
+                dirty.append(clipped)
+
+        for rect in dirty:
+            x, y, w, h = rect
+            self.frame[y:y + h, x:x + w] = self.source[y:y + h, x:x + w]
+            for region in self._regions:
+                inter = _intersect(region, rect)
+                if inter:
+                    ix, iy, iw, ih = inter
+                    self.frame[iy:iy + ih, ix:ix + iw] = self.blurred[iy:iy + ih, ix:ix + iw]
+        return dirty
@@ -0,0 +1,204 @@
+import bisect
+import re
+from dataclasses import dataclass
+from typing import Callable
+
+
+def luhn_valid(text: str) -> bool:
+    digits = [int(c) for c in text if c.isdigit()]
+    if not 13 <= len(digits) <= 19:
+        return False
+    total = 0
+    for i, digit in enumerate(reversed(digits)):
+        if i % 2:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
+# A phone needs a shape: a leading "+", a parenthesised area code, or
+# digit groups split by spaces or dashes. Bare digit runs (timestamps,
+# IDs) and anything touching ":", "/" or "." (times, paths, IPs) are not.
+_PHONE_PATTERN = (r'(?<![\w.:/+-])(?:\+\d{1,3}[ -]?(?:\(\d{1,4}\)[ -]?)?\d{1,4}(?:[ -]?\d{1,4}){1,4}'
+                  r'|\(\d{2,4}\)[ -]?\d{2,4}(?:[ -]?\d{2,4}){1,3}'
+                  r'|\d{1,4}(?:[ -]\d{2,4}){2,4})(?![\w.:/-])')
+_DATE = re.compile(r'\d{4}-\d{1,2}-\d{1,2}(?!\d)|\d{1,2}-\d{1,2}-\d{4}(?!\d)')
+
+
+def _phone_valid(text: str) -> bool:
+    return 10 <= sum(c.isdigit() for c in text) <= 15 and not _DATE.search(text)
+
+
+DIGITS = tuple("0123456789")
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    # Must not use global inline flags; use scoped groups like (?i:...).
+    pattern: str
+    validate: Callable[[str], bool] | None = None
+    # Prefilter: the rule is only tried on lines whose lowercased text
+    # contains at least one of these substrings. Empty means always.
+    needles: tuple[str, ...] = ()
+    # The match is a label ("password:"). When a separator follows it, the
+    # rest of the line is flagged as its value instead; otherwise the label.
+    key: bool = False
+
+
+RULES = [
+    # OCR often splits "name @ host" into separate tokens.
+    Rule("Email", r'[a-zA-Z0-9._%+-]+ ?@ ?[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)*\.[a-zA-Z]{2,}', needles=("@",)),
+    Rule("IP", r'\b(?:\d{1,3}\.){3}\d{1,3}\b', needles=(".",)),
+    Rule("Secret", r'(?i:(?<![A-Za-z0-9])(?:secret|password|passwd|token|api[_-]?key|auth)(?![A-Za-z0-9]))',
+         needles=("secret", "passw", "token", "api", "auth"), key=True),
+    Rule("JWT", r'\beyJ[A-Za-z0-9_-]{4,}\.[A-Za-z0-9_-]{4,}\.[A-Za-z0-9_-]{4,}', needles=("eyj",)),
+    Rule("AWSKey", r'\b(?:AKIA|ASIA)[0-9A-Z]{16}\b', needles=("akia", "asia")),
+    Rule("Card", r'\b\d(?:[ -]?\d){12,18}\b', luhn_valid, needles=DIGITS),
+    Rule("Phone", _PHONE_PATTERN, _phone_valid, needles=DIGITS),
+]
+
+
+class Matcher:
+    """Rules compiled into one alternation; the named group tells which rule fired.
+
+    A substring prefilter picks the rules that can possibly match a line, and
+    one combined regex per distinct rule subset is compiled and cached.
+    """
+
+    def __init__(self, rules: list[Rule]):
+        self.rules = list(rules)
+        self._single = [re.compile(rule.pattern) for rule in self.rules]
+        self._combined: dict[tuple[int, ...], re.Pattern] = {}
+
+    def _candidates(self, text: str) -> tuple[int, ...]:
+        lowered = text.lower()
+        return tuple(i for i, rule in enumerate(self.rules)
+                     if not rule.needles or any(n in lowered for n in rule.needles))
+
+    def _compiled(self, subset: tuple[int, ...]) -> re.Pattern:
+        regex = self._combined.get(subset)
+        if regex is None:
+            regex = re.compile("|".join(f"(?P<r{i}>{self.rules[i].pattern})" for i in subset))
+            self._combined[subset] = regex
+        return regex
+
+    def finditer(self, text: str):
+        """Yield (start, end, rule name) for every rule match in text."""
+        subset = self._candidates(text)
+        if not subset:
+            return
+        for match in self._compiled(subset).finditer(text):
+            rule = self.rules[int(match.lastgroup[1:])]
+            if rule.validate is None or rule.validate(match.group()):
+                yield match.start(), match.end(), rule.name
+                continue
+            # The failed candidate consumed the span; give the other rules a go.
+            for other, regex in zip(self.rules, self._single):
+                if other is rule:
+                    continue
+                for sub in regex.finditer(text, match.start(), match.end()):
+                    if other.validate is None or other.validate(sub.group()):
+                        yield sub.start(), sub.end(), other.name
+
+
+default_matcher = Matcher(RULES)
+
+
+# One of these right after a label ("password:", "token =", "key -> ...")
+# marks the rest of the line as its value.
+SEPARATOR_CHARS = ":=|"
+# A dash only separates with spaces around it: "password-protected" is one
+# word. Repeated, it joins peers ("Auth - Settings - Users") instead.
+DASHES = "-–—"
+
+
+def group_lines(words: list[dict]) -> list[list[int]]:
+    """Group word indices by their OCR line key, keeping reading order."""
+    lines: dict = {}
+    for idx, word in enumerate(words):
+        lines.setdefault(word["line"], []).append(idx)
+    return list(lines.values())
+
+
+def _value_start(text: str, end: int) -> int | None:
+    """Offset in ``text`` of the value after a label match ending at ``end``.
+
+    Only a separator makes what follows a value; in "my password is
+    hunter2" or "token-based login" there is none, and None is returned.
+    """
+    rest = text[end:]
+    spaced = rest.startswith(" ")
+    rest = rest.lstrip(" ")
+    head, arrow = rest[:1], rest.startswith("->")
+    if head and head in DASHES and not arrow:
+        if not spaced or rest[1:2] != " " or f" {head} " in rest[1:]:
+            return None
+    elif not (arrow or head and head in SEPARATOR_CHARS):
+        return None
+    value = rest.lstrip(" >" + SEPARATOR_CHARS + DASHES)
+    return len(text) - len(value) if value else None
+
+
+def _detect_line(words: list[dict], line: list[int], matcher: Matcher, keys: set[str], hits: dict[int, str]):
+    starts, ends = [], []
+    pos = 0
+    for idx in line:
+        starts.append(pos)
+        pos += len(words[idx]["text"])
+        ends.append(pos)
+        pos += 1
+    text = " ".join(words[idx]["text"] for idx in line)
+    for start, end, rule in matcher.finditer(text):
+        first = bisect.bisect_right(ends, start)
+        last = bisect.bisect_left(starts, end)
+        if rule in keys:
+            value = _value_start(text, end)
+            if value is not None:
+                # Values may contain spaces ("token: abc def").
+                first, last = bisect.bisect_right(ends, value), len(line)
+        for k in range(first, last):
+            hits.setdefault(line[k], rule)
+
+
+def detect(words: list[dict], matcher: Matcher = default_matcher) -> list[tuple[int, str]]:
+    """Match rules over whole OCR lines.
+
+    ``words`` are dicts with "text" and a hashable "line" key. Each line is
+    joined with single spaces, and every match is mapped back through the
+    character offsets to the words it overlaps; for a key rule followed by
+    a separator, to the words of the value after it instead. Returns (word
+    index, rule) pairs, at most one per word.
+    """
+    hits: dict[int, str] = {}
+    keys = {rule.name for rule in matcher.rules if rule.key}
+    for line in group_lines(words):
+        _detect_line(words, line, matcher, keys, hits)
+    return sorted(hits.items())
+
+
+def detect_spans(words: list[dict], matcher: Matcher = default_matcher) -> list[tuple[list[int], str]]:
+    """Like detect(), but adjacent flagged words of one line and rule form one span.
+
+    Returns (word indices, rule) pairs in reading order, so each span can be
+    covered by a single region.
+    """
+    keys = {rule.name for rule in matcher.rules if rule.key}
+    spans = []
+    for line in group_lines(words):
+        hits: dict[int, str] = {}
+        _detect_line(words, line, matcher, keys, hits)
+        run: list[int] = []
+        for idx in line:
+            rule = hits.get(idx)
+            if run and rule == hits[run[0]]:
+                run.append(idx)
+                continue
+            if run:
+                spans.append((run, hits[run[0]]))
+            run = [idx] if rule else []
+        if run:
+            spans.append((run, hits[run[0]]))
+    return spans
@@ -0,0 +1,112 @@
+"""Encoding sanitized frames to PNG, JPEG and WebP files.
+
+PNG is written by a streaming encoder: rows are filtered and deflated a band
+at a time, so besides the frame itself only one band and the compressor's
+window are in memory, and zlib releases the GIL while it works. JPEG, WebP
+and anything else OpenCV can write go through cv2.imencode in one call.
+Files are written next to the target under a temporary name and renamed
+into place when complete.
+"""
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from core.profiling import image_size, span
+
+FORMATS = {".png": "png", ".jpg": "jpeg", ".jpeg": "jpeg", ".webp": "webp"}
+DEFAULT_QUALITY = {"jpeg": 95, "webp": 90}
+# zlib level; 1 matches cv2.imwrite's default.
+PNG_COMPRESSION = 1
+PNG_BAND_ROWS = 128
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# PNG filter type 2: each byte minus the byte above it.
+_FILTER_UP = 2
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def format_for(path: str) -> str:
+    """The format name for FORMATS suffixes; other suffixes are passed to OpenCV as they are."""
+    suffix = os.path.splitext(path)[1].lower()
+    return FORMATS.get(suffix, suffix)
+
+
+def _png_chunk(kind: bytes, data: bytes = b"") -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(data, zlib.crc32(kind)))
+
+
+def _write_png(f, image, compression: int, on_progress, is_cancelled):
+    height, width = image.shape[:2]
+    f.write(_PNG_SIGNATURE)
+    f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+    # Z_RLE is what OpenCV uses for screenshots too: long runs of zero
+    # bytes after the Up filter, little to gain from longer matches.
+    compressor = zlib.compressobj(compression, zlib.DEFLATED, 15, 9, zlib.Z_RLE)
+    band = np.empty((PNG_BAND_ROWS, 1 + width * 3), np.uint8)
+    band[:, 0] = _FILTER_UP
+    previous = np.zeros(width * 3, np.uint8)
+    for y in range(0, height, PNG_BAND_ROWS):
+        if is_cancelled is not None and is_cancelled():
+            raise ExportCancelled()
+        rows = min(PNG_BAND_ROWS, height - y)
+        # BGR(A) -> RGB; channels 2, 1, 0 are the same for both layouts.
+        pixels = band[:rows, 1:].reshape(rows, width, 3)
+        pixels[:] = image[y:y + rows, :, 2::-1]
+        current = pixels.reshape(rows, width * 3)
+        last = current[-1].copy()
+        current[1:] -= current[:-1]
+        current[0] -= previous
+        previous = last
+        data = compressor.compress(band[:rows])
+        if data:
+            f.write(_png_chunk(b"IDAT", data))
+        if on_progress is not None:
+            on_progress((y + rows) / height)
+    f.write(_png_chunk(b"IDAT", compressor.flush()))
+    f.write(_png_chunk(b"IEND"))
+
+
+def _write_encoded(f, image, path: str, fmt: str, quality: int | None):
+    import cv2
+
+    params = []
+    if fmt in DEFAULT_QUALITY:
+        flag = cv2.IMWRITE_JPEG_QUALITY if fmt == "jpeg" else cv2.IMWRITE_WEBP_QUALITY
+        params = [flag, quality or DEFAULT_QUALITY[fmt]]
+    ok, encoded = cv2.imencode(os.path.splitext(path)[1], image[:, :, :3], params)
+    if not ok:
+        raise OSError(f"cannot encode image: {path}")
+    f.write(encoded.data)
+
+
+def write_image(image, path: str, quality: int | None = None, compression: int = PNG_COMPRESSION,
+                on_progress=None, is_cancelled=None):
+    """Encode a BGR or BGRA frame to ``path``; the format follows its extension.
+
+    ``quality`` (1-100) applies to JPEG and WebP, ``compression`` (0-9) to
+    PNG. ``on_progress(fraction)`` is called as encoding advances and
+    ``is_cancelled()`` is polled between PNG bands; when it returns True,
+    ExportCancelled is raised and nothing is left at ``path``. Alpha is
+    dropped: screen captures carry none.
+    """
+    fmt = format_for(path)
+    directory, name = os.path.split(os.path.abspath(path))
+    temp = os.path.join(directory, f".{name}.part")
+    with span("save", size=image_size(image), format=fmt):
+        try:
+            with open(temp, "wb") as f:
+                if fmt == "png":
+                    _write_png(f, image, compression, on_progress, is_cancelled)
+                else:
+                    _write_encoded(f, image, path, fmt, quality)
+                    if on_progress is not None:
+                        on_progress(1.0)
+            os.replace(temp, path)
+        except BaseException:
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
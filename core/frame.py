@@ -0,0 +1,27 @@
+"""Canonical frame buffers shared by capture, analysis and rendering.
+
+A frame is an HxWx4 (BGRA, as delivered by mss) or HxWx3 (BGR, as used by
+OpenCV) uint8 NumPy array. Both layouts map onto a QImage format without a
+copy, so pixels are only copied where a conversion is unavoidable.
+"""
+import numpy as np
+
+
+def bgra_view(buffer, width: int, height: int) -> np.ndarray:
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(height, width, 4)
+
+
+def crop(frame: np.ndarray, rect: tuple[int, int, int, int]) -> np.ndarray:
+    x, y, w, h = rect
+    h_img, w_img = frame.shape[:2]
+    x0, y0 = max(0, x), max(0, y)
+    return frame[y0:min(h_img, y + h), x0:min(w_img, x + w)]
+
+
+def to_bgr(frame: np.ndarray) -> np.ndarray:
+    """Return a contiguous BGR copy of the frame (or the frame itself if it already is one)."""
+    if frame.shape[2] == 4:
+        import cv2
+
+        return cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+    return np.ascontiguousarray(frame)
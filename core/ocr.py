@@ -0,0 +1,345 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from core import textdetect
+from core.profiling import image_size, span
+
+TESS_LANG = "eng"
+TESS_CONFIG = r'--oem 3 --psm 11'
+
+OCR_FIELDS = ("level", "page_num", "block_num", "par_num", "line_num", "word_num",
+              "left", "top", "width", "height", "conf", "text")
+
+# block_num of band i is shifted by i * BLOCK_STRIDE so that line keys stay
+# unique after the bands are merged back together.
+BLOCK_STRIDE = 10000
+
+
+@dataclass
+class OcrSettings:
+    # "auto" prefers the resident tesserocr engine and falls back to pytesseract.
+    backend: str = field(default_factory=lambda: os.environ.get("BLURVEIL_OCR_BACKEND", "auto"))
+    lang: str = TESS_LANG
+    tiled: bool = True
+    # None picks a band height that gives every worker one band.
+    tile_height: int | None = None
+    min_tile_height: int = 256
+    tile_overlap: int = 96
+    workers: int = os.cpu_count() or 1
+    # Smaller images are OCR'd with a single call.
+    min_tiled_pixels: int = 4_000_000
+    # Downscale images whose text is larger than Tesseract needs. Off by
+    # default: it costs recall on HiDPI captures (benchmarks.bench_ocr_scale --ocr).
+    adaptive_scale: bool = False
+    # Text line height (ascenders to descenders, as measured by
+    # textdetect.estimate_text_height) to scale towards; about a 30 px cap
+    # height, where Tesseract is most accurate.
+    target_text_height: int = 40
+    # Scaling by less than this factor is not worth the resize.
+    min_scale_gain: float = 1.25
+    min_scale: float = 0.25
+
+
+settings = OcrSettings()
+
+
+def _parse_value(value: str):
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def parse_tsv(tsv: str) -> dict:
+    data = {name: [] for name in OCR_FIELDS}
+    for line in tsv.splitlines():
+        parts = line.split("\t")
+        if len(parts) < len(OCR_FIELDS) - 1 or not parts[0].isdigit():
+            continue
+        for name, value in zip(OCR_FIELDS[:-1], parts):
+            data[name].append(_parse_value(value))
+        data["text"].append(parts[len(OCR_FIELDS) - 1] if len(parts) >= len(OCR_FIELDS) else "")
+    return data
+
+
+class OcrBackend(ABC):
+    name = ""
+
+    @abstractmethod
+    def image_to_data(self, image) -> dict:
+        """Tesseract word data (OCR_FIELDS lists) for a BGR or gray image."""
+
+
+class PytesseractBackend(OcrBackend):
+    """Runs the tesseract binary once per call; always available."""
+
+    name = "pytesseract"
+
+    def __init__(self, lang: str = TESS_LANG):
+        self.lang = lang
+
+    def image_to_data(self, image) -> dict:
+        import pytesseract
+
+        return pytesseract.image_to_data(image, lang=self.lang, output_type=pytesseract.Output.DICT,
+                                         config=TESS_CONFIG)
+
+
+class TesserocrBackend(OcrBackend):
+    """Keeps one libtesseract instance with the language data loaded."""
+
+    name = "tesserocr"
+
+    def __init__(self, lang: str = TESS_LANG):
+        import tesserocr
+        from PIL import Image
+
+        self._image_cls = Image
+        self._api = tesserocr.PyTessBaseAPI(lang=lang, psm=tesserocr.PSM.SPARSE_TEXT,
+                                            oem=tesserocr.OEM.DEFAULT)
+        # PyTessBaseAPI is not thread-safe.
+        self._lock = threading.Lock()
+
+    def image_to_data(self, image) -> dict:
+        pil_image = self._image_cls.fromarray(to_gray(image))
+        with self._lock:
+            self._api.SetImage(pil_image)
+            self._api.Recognize()
+            tsv = self._api.GetTSVText(0)
+        return parse_tsv(tsv)
+
+
+BACKENDS = {
+    "tesserocr": TesserocrBackend,
+    "pytesseract": PytesseractBackend,
+}
+
+_backend: OcrBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def create_backend(name: str = "auto", lang: str = TESS_LANG) -> OcrBackend:
+    if name != "auto":
+        return BACKENDS[name](lang)
+    try:
+        return TesserocrBackend(lang)
+    except (ImportError, RuntimeError):
+        return PytesseractBackend(lang)
+
+
+def get_backend() -> OcrBackend:
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_backend(settings.backend, settings.lang)
+        return _backend
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _init_pool_worker(backend: str, lang: str):
+    settings.backend = backend
+    settings.lang = lang
+    get_backend()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            # spawn, not fork: the GUI process is multi-threaded.
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=_init_pool_worker, initargs=(settings.backend, settings.lang))
+            _pool_workers = workers
+        return _pool
+
+
+@atexit.register
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def to_gray(image):
+    if image.ndim == 2:
+        return image
+    import cv2
+
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def ocr_single(image) -> dict:
+    return get_backend().image_to_data(image)
+
+
+def import_engine():
+    """Import the tesserocr module, if it is installed, on the calling thread.
+
+    tesserocr loads cysignals, which installs signal handlers and so fails
+    to import anywhere but the main thread. Call this there before OCR
+    runs on worker threads.
+    """
+    if settings.backend in ("auto", "tesserocr"):
+        try:
+            import tesserocr  # noqa: F401
+        except ImportError:
+            pass
+
+
+def split_bands(height: int, tile_height: int, overlap: int) -> list[tuple[int, int]]:
+    """Split [0, height) into bands of tile_height rows overlapping by overlap rows."""
+    if tile_height <= overlap:
+        raise ValueError("tile_height must be larger than tile_overlap")
+    if height <= tile_height:
+        return [(0, height)]
+    step = tile_height - overlap
+    bands = []
+    y = 0
+    while True:
+        y_end = min(height, y + tile_height)
+        bands.append((y, y_end))
+        if y_end == height:
+            return bands
+        y += step
+
+
+def _overlap_ratio(a: dict, b: dict) -> float:
+    ix = min(a["left"] + a["width"], b["left"] + b["width"]) - max(a["left"], b["left"])
+    iy = min(a["top"] + a["height"], b["top"] + b["height"]) - max(a["top"], b["top"])
+    if ix <= 0 or iy <= 0:
+        return 0.0
+    smaller = min(a["width"] * a["height"], b["width"] * b["height"])
+    return ix * iy / smaller if smaller else 0.0
+
+
+def _merge_bands(bands: list[tuple[int, int]], results: list[dict], height: int) -> dict:
+    words = []
+    for band_idx, ((y0, y1), data) in enumerate(zip(bands, results)):
+        for i in range(len(data["text"])):
+            if not str(data["text"][i]).strip():
+                continue
+            word = {field: data[field][i] for field in OCR_FIELDS}
+            word["top"] += y0
+            word["block_num"] += band_idx * BLOCK_STRIDE
+            # Words touching an inner band edge may be cut in half; the
+            # neighbouring band sees them whole thanks to the overlap.
+            word["_cut"] = (y0 > 0 and word["top"] <= y0 + 1) or \
+                           (y1 < height and word["top"] + word["height"] >= y1 - 1)
+            word["_line"] = (band_idx, word["block_num"], word["par_num"], word["line_num"])
+            words.append(word)
+
+    seams = [(bands[i + 1][0], bands[i][1]) for i in range(len(bands) - 1)]
+
+    def seam_of(word) -> int | None:
+        for idx, (s0, s1) in enumerate(seams):
+            if word["top"] < s1 and word["top"] + word["height"] > s0:
+                return idx
+        return None
+
+    lines: dict[tuple, list[int]] = {}
+    for idx, word in enumerate(words):
+        lines.setdefault(word["_line"], []).append(idx)
+    by_seam: dict[int, dict[tuple, None]] = {}
+    for idx, word in enumerate(words):
+        seam = seam_of(word)
+        if seam is not None:
+            by_seam.setdefault(seam, {})[word["_line"]] = None
+
+    def rank(line) -> tuple:
+        idxs = lines[line]
+        return (any(words[i]["_cut"] for i in idxs), -sum(words[i]["width"] * words[i]["height"] for i in idxs))
+
+    def overlaps(a, b) -> bool:
+        return any(_overlap_ratio(words[i], words[j]) > 0.5 for i in lines[a] for j in lines[b])
+
+    # A seam line is taken whole from one band: detection matches per OCR
+    # line, so mixing words of both bands would break it in two.
+    dropped = set()
+    for candidates in by_seam.values():
+        kept: list[tuple] = []
+        for line in sorted(candidates, key=rank):
+            if any(k[0] != line[0] and overlaps(line, k) for k in kept):
+                dropped.update(lines[line])
+            else:
+                kept.append(line)
+
+    merged = {field: [] for field in OCR_FIELDS}
+    for idx, word in enumerate(words):
+        if idx in dropped:
+            continue
+        for field in OCR_FIELDS:
+            merged[field].append(word[field])
+    return merged
+
+
+def ocr_tiled(image, tile_height: int | None = None, overlap: int | None = None,
+              workers: int | None = None) -> dict:
+    overlap = settings.tile_overlap if overlap is None else overlap
+    workers = workers or settings.workers
+
+    gray = to_gray(image)
+    height = gray.shape[0]
+    tile_height = tile_height or settings.tile_height or \
+        max(settings.min_tile_height, -(-height // workers) + overlap)
+    bands = split_bands(height, tile_height, overlap)
+    if len(bands) == 1 or workers <= 1:
+        results = [ocr_single(gray[y0:y1]) for y0, y1 in bands]
+    else:
+        pool = _get_pool(workers)
+        results = list(pool.map(ocr_single, [gray[y0:y1] for y0, y1 in bands]))
+    return _merge_bands(bands, results, height)
+
+
+def _ocr_frame(gray) -> dict:
+    if settings.tiled and gray.shape[0] * gray.shape[1] >= settings.min_tiled_pixels:
+        return ocr_tiled(gray)
+    return ocr_single(gray)
+
+
+def ocr_scale(gray) -> float:
+    """Factor to resize ``gray`` by before OCR; 1.0 leaves it alone."""
+    if not settings.adaptive_scale:
+        return 1.0
+    height = textdetect.estimate_text_height(gray)
+    if height is None or height < settings.target_text_height * settings.min_scale_gain:
+        return 1.0
+    return max(settings.min_scale, settings.target_text_height / height)
+
+
+def _rescale_boxes(data: dict, scale: float) -> dict:
+    for name in ("left", "top"):
+        data[name] = [int(v / scale) for v in data[name]]
+    for name in ("width", "height"):
+        data[name] = [int(np.ceil(v / scale)) for v in data[name]]
+    return data
+
+
+def image_to_data(image) -> dict:
+    """Tesseract word data for a BGR or gray image, in the image's coordinates."""
+    import cv2
+
+    with span("ocr.gray", size=image_size(image)):
+        gray = to_gray(image)
+    with span("ocr.scale") as attrs:
+        scale = ocr_scale(gray)
+        attrs["scale"] = round(scale, 3)
+        if scale < 1.0:
+            gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    with span("ocr.tesseract", size=image_size(gray)):
+        data = _ocr_frame(gray)
+    return _rescale_boxes(data, scale) if scale < 1.0 else data
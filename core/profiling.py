@@ -0,0 +1,137 @@
+import contextvars
+import itertools
+import json
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+RING_SIZE = 4096
+
+_trace: contextvars.ContextVar[int] = contextvars.ContextVar("blurveil_trace", default=0)
+_trace_ids = itertools.count(1)
+
+
+def new_trace() -> int:
+    """Start a new trace (one snip) in the current context and return its id."""
+    trace_id = next(_trace_ids)
+    _trace.set(trace_id)
+    return trace_id
+
+
+def current_trace() -> int:
+    return _trace.get()
+
+
+@contextmanager
+def trace(trace_id: int):
+    """Attribute spans opened in this block to an existing trace."""
+    token = _trace.set(trace_id)
+    try:
+        yield
+    finally:
+        _trace.reset(token)
+
+
+def image_size(image) -> str:
+    return f"{image.shape[1]}x{image.shape[0]}"
+
+
+class Profiler:
+    """Ring buffer of finished spans, optionally mirrored to a JSON-lines file.
+
+    Spans use the monotonic perf_counter clock; ``start_ms`` is relative to
+    the profiler's creation so spans of one trace can be laid out in time.
+    """
+
+    def __init__(self, size: int = RING_SIZE):
+        self.spans: deque[dict] = deque(maxlen=size)
+        self.enabled = True
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._export = None
+
+    def record(self, name: str, start: float, end: float, attrs: dict):
+        entry = {
+            "name": name,
+            "trace": _trace.get(),
+            "start_ms": round(1000 * (start - self._origin), 3),
+            "ms": round(1000 * (end - start), 3),
+            "thread": threading.current_thread().name,
+            **attrs,
+        }
+        self.spans.append(entry)
+        if self._export is not None:
+            line = json.dumps(entry, ensure_ascii=False, default=str)
+            with self._lock:
+                if self._export is not None:
+                    self._export.write(line + "\n")
+                    self._export.flush()
+
+    def export_to(self, path: str | None):
+        """Append every span recorded from now on to ``path`` as JSON lines."""
+        with self._lock:
+            if self._export is not None:
+                self._export.close()
+            self._export = open(path, "a", encoding="utf-8") if path else None
+
+    def dump(self, path: str):
+        """Write the spans currently in the ring buffer to ``path`` as JSON lines."""
+        with open(path, "w", encoding="utf-8") as f:
+            for entry in list(self.spans):
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+    def clear(self):
+        self.spans.clear()
+
+    def summary(self) -> list[dict]:
+        by_name: dict[str, list[float]] = {}
+        for entry in list(self.spans):
+            by_name.setdefault(entry["name"], []).append(entry["ms"])
+        rows = []
+        for name, samples in by_name.items():
+            samples.sort()
+            rows.append({
+                "name": name,
+                "count": len(samples),
+                "median_ms": statistics.median(samples),
+                "p90_ms": samples[int(0.9 * (len(samples) - 1))],
+                "max_ms": samples[-1],
+                "total_ms": sum(samples),
+            })
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def report(self, last_traces: int = 3) -> str:
+        lines = [f"{'stage':<22} {'n':>5} {'median ms':>10} {'p90 ms':>9} {'max ms':>9}"]
+        for row in self.summary():
+            lines.append(f"{row['name']:<22} {row['count']:>5} {row['median_ms']:>10.1f} "
+                         f"{row['p90_ms']:>9.1f} {row['max_ms']:>9.1f}")
+        spans = list(self.spans)
+        traces = sorted({entry["trace"] for entry in spans if entry["trace"]})[-last_traces:]
+        for trace_id in traces:
+            lines.append("")
+            lines.append(f"trace {trace_id}:")
+            for entry in sorted((e for e in spans if e["trace"] == trace_id), key=lambda e: e["start_ms"]):
+                extra = {k: v for k, v in entry.items()
+                         if k not in ("name", "trace", "start_ms", "ms", "thread")}
+                details = " ".join(f"{k}={v}" for k, v in extra.items())
+                lines.append(f"  +{entry['start_ms']:>10.1f} {entry['name']:<22} {entry['ms']:>9.1f} ms  {details}")
+        return "\n".join(lines)
+
+
+profiler = Profiler()
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time the block as one span; the yielded dict takes attributes known only at the end."""
+    if not profiler.enabled:
+        yield attrs
+        return
+    start = time.perf_counter()
+    try:
+        yield attrs
+    finally:
+        profiler.record(name, start, time.perf_counter(), attrs)
@@ -0,0 +1,61 @@
+import threading
+
+import numpy as np
+
+QR_PAD = 8
+
+_local = threading.local()
+
+
+def _detectors():
+    """Per-thread detector instances; OpenCV's detectors are not thread-safe."""
+    import cv2
+
+    if not hasattr(_local, "qr"):
+        _local.qr = cv2.QRCodeDetector()
+        barcode = getattr(cv2, "barcode", None)
+        _local.barcode = barcode.BarcodeDetector() if barcode is not None else None
+    return _local.qr, _local.barcode
+
+
+def _to_gray(image):
+    import cv2
+
+    if image.ndim == 2:
+        return image
+    code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+    return cv2.cvtColor(image, code)
+
+
+def _find(detector, gray) -> list[np.ndarray]:
+    if detector is None:
+        return []
+    found, points = detector.detectMulti(gray)
+    if not found or points is None:
+        return []
+    return [np.asarray(p, dtype=np.float32).reshape(-1, 2) for p in points]
+
+
+def _bounds(pts, w_img: int, h_img: int, pad: int) -> tuple[int, int, int, int]:
+    x_min = max(0, int(pts[:, 0].min()) - pad)
+    y_min = max(0, int(pts[:, 1].min()) - pad)
+    x_max = min(w_img, int(np.ceil(pts[:, 0].max())) + pad)
+    y_max = min(h_img, int(np.ceil(pts[:, 1].max())) + pad)
+    return x_min, y_min, x_max - x_min, y_max - y_min
+
+
+def detect_codes(image) -> list[tuple[str, tuple[int, int, int, int]]]:
+    """Locate QR codes and barcodes without decoding them.
+
+    Returns (kind, (x, y, w, h)) pairs, kind being "QR" or "Barcode".
+    The search runs at full resolution for every frame size: OpenCV stops
+    finding codes whose modules shrink below ~3-4 px, so a downscaled
+    search misses the small codes of 5K and 8K captures.
+    """
+    gray = _to_gray(image)
+    h_img, w_img = gray.shape[:2]
+    regions = []
+    for kind, detector in zip(("QR", "Barcode"), _detectors()):
+        for pts in _find(detector, gray):
+            regions.append((kind, _bounds(pts, w_img, h_img, QR_PAD)))
+    return regions
@@ -0,0 +1,97 @@
+"""Client for the local socket of a running Blurveil tray instance (gui.ipc).
+
+The protocol is JSON lines. A request is
+{"id": ..., "input": path, "output": path, "mode": ..., "quality": ...,
+"compression": ...}; the instance answers each one, in completion order,
+with the core.batch report entry for it plus the request's "id". Paths
+are resolved by the client, since the instance has its own working
+directory. On Unix the socket is only accessible to the current user.
+"""
+import getpass
+import json
+import os
+import socket
+import sys
+import tempfile
+from typing import Iterator
+
+from core import export
+
+CONNECT_TIMEOUT = 2.0
+
+
+class RemoteUnavailable(OSError):
+    pass
+
+
+def server_name() -> str:
+    """The QLocalServer name: a socket path on Unix, a pipe name on Windows."""
+    if "BLURVEIL_SOCKET" in os.environ:
+        return os.environ["BLURVEIL_SOCKET"]
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "user"
+    if sys.platform == "win32":
+        return f"blurveil-{user}"
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(directory, f"blurveil-{user}.sock")
+
+
+class _Pipe:
+    """The subset of the socket API used below, over a Windows named pipe."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "r+b", buffering=0)
+
+    def sendall(self, data: bytes):
+        view = memoryview(data)
+        while view:
+            view = view[self._file.write(view):]
+
+    def recv(self, size: int) -> bytes:
+        return self._file.read(size)
+
+    def close(self):
+        self._file.close()
+
+
+def _connect():
+    name = server_name()
+    try:
+        if sys.platform == "win32":
+            return _Pipe(rf"\\.\pipe\{name}")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(name)
+        sock.settimeout(None)
+        return sock
+    except OSError as exc:
+        raise RemoteUnavailable(f"no running Blurveil instance at {name}: {exc}") from exc
+
+
+def submit(jobs: list[tuple[str, str]], mode: str = "blur", quality: int | None = None,
+           compression: int = export.PNG_COMPRESSION) -> Iterator[dict]:
+    """Sanitize (src, dst) pairs in the running instance; yield entries as they finish."""
+    conn = _connect()
+    try:
+        requests = []
+        for i, (src, dst) in enumerate(jobs):
+            requests.append(json.dumps({"id": i, "input": os.path.abspath(src), "output": os.path.abspath(dst),
+                                        "mode": mode, "quality": quality, "compression": compression}))
+        conn.sendall("".join(line + "\n" for line in requests).encode())
+        pending = len(jobs)
+        buffer = b""
+        while pending:
+            chunk = conn.recv(65536)
+            if not chunk:
+                raise RemoteUnavailable("the Blurveil instance closed the connection")
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                entry = json.loads(line)
+                entry.pop("id", None)
+                pending -= 1
+                yield entry
+    finally:
+        conn.close()
@@ -1,95 +1,161 @@
-import cv2
-import numpy as np
-import pytesseract
-import re
-from PyQt6.QtGui import QImage, QPixmap
-
-TESS_CONFIG = r'--oem 3 --psm 11'
-
-PATTERNS = {
-    "Email": r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
-    "IP": r'\b(?:\d{1,3}\.){3}\d{1,3}\b',
-    "Secret": r'(?i)\b(secret|password|passwd|token|api[_-]?key|auth)\b',
-}
-
-
-def qpixmap_to_cv_image(pixmap: QPixmap):
-    qimage = pixmap.toImage().convertToFormat(QImage.Format.Format_RGBA8888)
-    width = qimage.width()
-    height = qimage.height()
-    ptr = qimage.bits()
-    ptr.setsize(height * width * 4)
-    arr = np.frombuffer(ptr, np.uint8).reshape((height, width, 4))
-    return cv2.cvtColor(arr, cv2.COLOR_RGBA2BGR)
-
-
-def cv_image_to_qpixmap(cv_img):
-    height, width, _ = cv_img.shape
-    bytes_per_line = 3 * width
-    cv_img_rgb = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB)
-    qimage = QImage(cv_img_rgb.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
-    return QPixmap.fromImage(qimage)
-
-
-def apply_blur_regions(cv_img, regions: list[tuple[int, int, int, int]]):
-    result = cv_img.copy()
-    for (x, y, w, h) in regions:
-        roi = result[y:y+h, x:x+w]
-        if roi.size > 0:
-            result[y:y+h, x:x+w] = cv2.GaussianBlur(roi, (51, 51), 30)
-    return result
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from core import blur, detectors, export, ocr, qr
+from core.blur import BLUR_KERNEL, BLUR_SIGMA  # noqa: F401 - re-exported
+from core.cache import image_key
+from core.profiling import image_size, span
+
+
+def apply_blur_regions(cv_img, regions: list[tuple[int, int, int, int]], mode: str = "blur"):
+    with span("blur", size=image_size(cv_img), regions=len(regions), mode=mode):
+        return blur.apply(cv_img, regions, mode)
 
 
 def detect_qr_codes(cv_img) -> list[tuple[int, int, int, int]]:
-    detector = cv2.QRCodeDetector()
-    retval, _decoded, points, _ = detector.detectAndDecodeMulti(cv_img)
-    regions = []
-    if retval and points is not None:
-        pad = 8
-        h_img, w_img = cv_img.shape[:2]
-        for pts in points:
-            pts = pts.astype(int)
-            x_min = max(0, int(pts[:, 0].min()) - pad)
-            y_min = max(0, int(pts[:, 1].min()) - pad)
-            x_max = min(w_img, int(pts[:, 0].max()) + pad)
-            y_max = min(h_img, int(pts[:, 1].max()) + pad)
-            regions.append((x_min, y_min, x_max - x_min, y_max - y_min))
-    return regions
-
-
-def analyze_image(pixmap: QPixmap) -> dict:
-    image = qpixmap_to_cv_image(pixmap)
-    data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT, config=TESS_CONFIG)
+    return [rect for _kind, rect in qr.detect_codes(cv_img)]
+
+
+def _detect_codes(image) -> list[tuple[str, tuple[int, int, int, int]]]:
+    with span("codes", size=image_size(image)) as attrs:
+        codes = qr.detect_codes(image)
+        attrs["regions"] = len(codes)
+    return codes
+
+
+def _bounding_rect(rects: list[tuple[int, int, int, int]]) -> tuple[int, int, int, int]:
+    x0 = min(x for x, _, _, _ in rects)
+    y0 = min(y for _, y, _, _ in rects)
+    x1 = max(x + w for x, _, w, _ in rects)
+    y1 = max(y + h for _, y, _, h in rects)
+    return x0, y0, x1 - x0, y1 - y0
+
+
+# Code detection runs here while OCR holds the calling thread.
+_code_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="blurveil-codes")
+
+
+class AnalysisCancelled(Exception):
+    pass
+
+
+def analyze_array(image, on_progress=None, is_cancelled=None, cache=None) -> dict:
+    """Run OCR and QR/barcode detection on a BGR image.
+
+    ``on_progress(ocr_boxes, regions)`` is called with the new results of
+    each stage as soon as that stage finishes. ``is_cancelled()`` is polled
+    between stages; when it returns True, AnalysisCancelled is raised.
+    Results are looked up in and stored to ``cache`` (an AnalysisCache)
+    when one is given.
+    """
+    def check_cancelled():
+        if is_cancelled is not None and is_cancelled():
+            raise AnalysisCancelled()
+
+    with span("analyze", size=image_size(image), cached=False) as attrs:
+        result = _analyze(image, on_progress, is_cancelled, cache, check_cancelled, attrs)
+        attrs["regions"] = len(result["auto_regions"])
+    return result
+
+
+def _analyze(image, on_progress, is_cancelled, cache, check_cancelled, span_attrs: dict) -> dict:
+    key = None
+    if cache is not None:
+        with span("cache.lookup"):
+            key = image_key(image)
+            cached = cache.get(key)
+        if cached is not None:
+            if on_progress is not None:
+                on_progress(list(cached["ocr_boxes"]), list(cached["auto_regions"]))
+            span_attrs["cached"] = True
+            return {"cv_image": image, **cached}
+
+    check_cancelled()
+    # The worker thread records its span under the caller's trace.
+    codes = _code_pool.submit(contextvars.copy_context().run, _detect_codes, image)
+    with span("ocr", size=image_size(image)) as attrs:
+        data = ocr.image_to_data(image)
+        attrs["tokens"] = len(data["text"])
 
     ocr_boxes = []
-    auto_regions = []
+    words = []
     pad = 4
 
     for i in range(len(data['text'])):
-        text = data['text'][i].strip()
+        text = str(data['text'][i]).strip()
         if not text or int(data['conf'][i]) < 20:
             continue
         x, y, w, h = data['left'][i], data['top'][i], data['width'][i], data['height'][i]
         rect = (max(0, x - pad), max(0, y - pad), w + pad * 2, h + pad * 2)
         ocr_boxes.append({"rect": rect, "text": text})
-        if any(re.search(pattern, text) for pattern in PATTERNS.values()):
-            auto_regions.append(rect)
-
-    auto_regions.extend(detect_qr_codes(image))
-
-    return {
+        line = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        words.append({"text": text, "line": line})
+
+    with span("detect", words=len(words)) as attrs:
+        spans = detectors.detect_spans(words)
+        attrs["hits"] = len(spans)
+    detections = [{"rect": _bounding_rect([ocr_boxes[idx]["rect"] for idx in idxs]), "rule": rule}
+                  for idxs, rule in spans]
+    auto_regions = [d["rect"] for d in detections]
+
+    if on_progress is not None:
+        on_progress(list(ocr_boxes), list(auto_regions))
+    if is_cancelled is not None and is_cancelled():
+        codes.cancel()
+        raise AnalysisCancelled()
+
+    with span("codes.wait"):
+        found = codes.result()
+    code_regions = []
+    for kind, rect in found:
+        detections.append({"rect": rect, "rule": kind})
+        code_regions.append(rect)
+    auto_regions.extend(code_regions)
+    if on_progress is not None:
+        on_progress([], code_regions)
+
+    result = {
         "cv_image": image,
         "ocr_boxes": ocr_boxes,
         "auto_regions": auto_regions,
+        "detections": detections,
     }
+    if cache is not None:
+        cache.put(key, result)
+    return result
 
 
-def render_image(cv_image, regions: list[tuple[int, int, int, int]]) -> QPixmap:
-    return cv_image_to_qpixmap(apply_blur_regions(cv_image, regions))
-
-
-def save_clean(cv_image, regions: list[tuple[int, int, int, int]], file_path: str) -> bool:
-    result = apply_blur_regions(cv_image, regions)
-    if file_path.lower().endswith(('.jpg', '.jpeg')):
-        return cv2.imwrite(file_path, result, [cv2.IMWRITE_JPEG_QUALITY, 95])
-    return cv2.imwrite(file_path, result)
+def warm_up():
+    """Run the whole pipeline once on a tiny image so the first real snip starts warm.
+
+    Loads the in-process OCR engine, OpenCV and the code detectors. The tile
+    workers, one process per core, start with the first frame large enough
+    to be OCR'd in tiles. Errors are ignored here; the first real analysis
+    reports them.
+    """
+    import cv2
+    import numpy as np
+
+    image = np.full((48, 320, 3), 255, np.uint8)
+    cv2.putText(image, "warm up 10.0.0.1", (8, 32), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
+    try:
+        result = analyze_array(image)
+        for mode in blur.MODES:
+            render_array(image, result["auto_regions"] or [(0, 0, 32, 16)], mode)
+    except Exception:
+        pass
+
+
+def render_array(cv_image, regions: list[tuple[int, int, int, int]], mode: str = "blur"):
+    return apply_blur_regions(cv_image, regions, mode)
+
+
+def save_clean(cv_image, regions: list[tuple[int, int, int, int]], file_path: str,
+               mode: str = "blur", quality: int | None = None,
+               compression: int = export.PNG_COMPRESSION) -> bool:
+    result = render_array(cv_image, regions, mode)
+    try:
+        export.write_image(result, file_path, quality, compression)
+    except OSError:
+        return False
+    return True
@@ -0,0 +1,79 @@
+from typing import Hashable, Iterator
+
+CELL = 128
+
+
+class GridIndex:
+    """Uniform grid of buckets over (x, y, w, h) rectangles for hit-testing.
+
+    Each rectangle is listed in every cell it overlaps, so a point query
+    only looks at one cell's entries. Keys must be hashable and stable;
+    insert and remove are incremental.
+    """
+
+    def __init__(self, cell: int = CELL):
+        self.cell = cell
+        self._cells: dict[tuple[int, int], dict[Hashable, None]] = {}
+        self._rects: dict[Hashable, tuple[int, int, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def __contains__(self, key) -> bool:
+        return key in self._rects
+
+    def _cells_of(self, rect) -> Iterator[tuple[int, int]]:
+        x, y, w, h = rect
+        c = self.cell
+        for cy in range(int(y) // c, int(y + max(h, 0)) // c + 1):
+            for cx in range(int(x) // c, int(x + max(w, 0)) // c + 1):
+                yield cx, cy
+
+    def insert(self, key, rect: tuple[int, int, int, int]):
+        if key in self._rects:
+            self.remove(key)
+        rect = tuple(rect)
+        self._rects[key] = rect
+        for cell in self._cells_of(rect):
+            self._cells.setdefault(cell, {})[key] = None
+
+    def remove(self, key):
+        rect = self._rects.pop(key, None)
+        if rect is None:
+            return
+        for cell in self._cells_of(rect):
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self._cells[cell]
+
+    def clear(self):
+        self._cells.clear()
+        self._rects.clear()
+
+    def rect(self, key) -> tuple[int, int, int, int]:
+        return self._rects[key]
+
+    def at(self, x: float, y: float) -> list:
+        """Keys whose rectangle contains the point, edges included."""
+        bucket = self._cells.get((int(x) // self.cell, int(y) // self.cell), ())
+        hits = []
+        for key in bucket:
+            rx, ry, rw, rh = self._rects[key]
+            if rx <= x <= rx + rw and ry <= y <= ry + rh:
+                hits.append(key)
+        return hits
+
+    def intersecting(self, rect: tuple[int, int, int, int]) -> set:
+        """Keys whose rectangle overlaps ``rect``."""
+        x, y, w, h = rect
+        found = set()
+        for cell in self._cells_of(rect):
+            for key in self._cells.get(cell, ()):
+                if key in found:
+                    continue
+                rx, ry, rw, rh = self._rects[key]
+                if rx <= x + w and x <= rx + rw and ry <= y + h and y <= ry + rh:
+                    found.add(key)
+        return found
@@ -0,0 +1,49 @@
+import numpy as np
+
+# Gradient strength below this is treated as flat background even when Otsu
+# picks a lower threshold on an almost empty image.
+MIN_GRADIENT = 24
+# Ruled lines, window borders and table grids longer than this are removed
+# before grouping so they do not glue unrelated text together.
+LINE_LENGTH = 80
+WORD_GAP = 15
+MIN_BOX = 6
+MAX_LINE_HEIGHT = 160
+MIN_TEXT_HEIGHT = 4
+MIN_TEXT_COMPONENTS = 8
+TEXT_HEIGHT_PERCENTILE = 20
+
+
+def _edge_mask(gray):
+    import cv2
+
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+    grad = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, kernel)
+    threshold, _ = cv2.threshold(grad, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    _, mask = cv2.threshold(grad, max(threshold, MIN_GRADIENT), 255, cv2.THRESH_BINARY)
+
+    lines = cv2.morphologyEx(mask, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (LINE_LENGTH, 1)))
+    lines |= cv2.morphologyEx(mask, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (1, LINE_LENGTH)))
+    return cv2.subtract(mask, lines)
+
+
+def estimate_text_height(gray) -> float | None:
+    """Height in pixels of the smaller common text lines, or None without text.
+
+    Word/line components of the edge mask are measured on a copy subsampled
+    so it is about 1080 px on its short side, which keeps WORD_GAP joining
+    letters at any scale. A low percentile is used so the smallest common
+    text, not just body text, stays legible after scaling.
+    """
+    import cv2
+
+    step = max(1, min(gray.shape[:2]) // 1080)
+    mask = _edge_mask(gray[::step, ::step])
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (WORD_GAP, 3)))
+    _, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    heights = [h for _, _, w, h, _ in stats[1:]
+               if w >= MIN_BOX and MIN_TEXT_HEIGHT <= h <= MAX_LINE_HEIGHT and w > h]
+    if len(heights) < MIN_TEXT_COMPONENTS:
+        return None
+    return float(np.percentile(heights, TEXT_HEIGHT_PERCENTILE)) * step
+
@@ -0,0 +1,69 @@
+from PyQt6.QtCore import QRect
+from PyQt6.QtGui import QCursor, QGuiApplication, QScreen
+import mss
+
+from core import frame
+from core.profiling import span
+
+
+class Capture:
+    """One grabbed monitor: its BGRA frame and where it sits on the Qt desktop."""
+
+    def __init__(self, bgra, geometry: QRect):
+        self.frame = bgra
+        self.geometry = geometry
+
+    @property
+    def pixel_ratio(self) -> float:
+        return self.frame.shape[1] / self.geometry.width()
+
+
+class ScreenCapture:
+    """Grabs the monitor under the cursor with one long-lived mss instance.
+
+    mss keeps per-thread display handles on some platforms, so an instance
+    must be created and used on the GUI thread. Only the monitor the cursor
+    is on is grabbed; when it cannot be matched to a QScreen the whole
+    virtual desktop is grabbed instead.
+    """
+
+    def __init__(self):
+        self._sct = None
+
+    @property
+    def sct(self):
+        if self._sct is None:
+            self._sct = mss.mss()
+        return self._sct
+
+    def close(self):
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
+    def _monitor_for(self, screen: QScreen) -> dict | None:
+        # mss reports physical pixels on Windows and logical ones elsewhere.
+        geometry, ratio = screen.geometry(), screen.devicePixelRatio()
+        origins = [(geometry.x(), geometry.y()), (round(geometry.x() * ratio), round(geometry.y() * ratio))]
+        for origin in origins:
+            for monitor in self.sct.monitors[1:]:
+                if (monitor["left"], monitor["top"]) == origin:
+                    return monitor
+        return None
+
+    def _grab(self, monitor: dict, geometry: QRect) -> Capture:
+        with span("capture", monitor=f"{monitor['width']}x{monitor['height']}") as attrs:
+            screenshot = self.sct.grab(monitor)
+            attrs["size"] = f"{screenshot.width}x{screenshot.height}"
+        return Capture(frame.bgra_view(screenshot.raw, screenshot.width, screenshot.height), geometry)
+
+    def grab_under_cursor(self) -> Capture:
+        screen = QGuiApplication.screenAt(QCursor.pos()) or QGuiApplication.primaryScreen()
+        monitor = self._monitor_for(screen)
+        if monitor is None:
+            return self.grab_desktop()
+        return self._grab(monitor, screen.geometry())
+
+    def grab_desktop(self) -> Capture:
+        """The bounding box of all monitors, for when per-monitor matching fails."""
+        return self._grab(self.sct.monitors[0], QGuiApplication.primaryScreen().virtualGeometry())
@@ -0,0 +1,107 @@
+import json
+
+from PyQt6.QtCore import QObject, QThreadPool
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+from core import export
+from core.batch import sanitize_file
+from core.remote import server_name
+from gui.worker import CallTask
+
+IPC_WORKERS = 2
+# Longest request line accepted from a client.
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+def _sanitize_request(request: dict) -> dict:
+    src, dst = request["input"], request["output"]
+    try:
+        entry = sanitize_file(src, dst, request.get("mode", "blur"), request.get("quality"),
+                              request.get("compression", export.PNG_COMPRESSION))
+    except Exception as exc:
+        entry = {"input": src, "output": dst, "error": str(exc)}
+    return {"id": request.get("id"), **entry}
+
+
+class IpcServer(QObject):
+    """Serves core.remote requests on a local socket, using this process's warm engines.
+
+    Requests run on a private thread pool and are answered in completion
+    order. Only one instance serves a name: start() returns False when
+    another one is already listening.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(IPC_WORKERS)
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._server.newConnection.connect(self._on_connection)
+        self._buffers: dict[QLocalSocket, bytes] = {}
+        self._jobs: set[CallTask] = set()
+
+    @property
+    def name(self) -> str:
+        return self._server.fullServerName()
+
+    def start(self) -> bool:
+        name = server_name()
+        probe = QLocalSocket()
+        probe.connectToServer(name)
+        if probe.waitForConnected(200):
+            probe.disconnectFromServer()
+            return False
+        # Left behind by an instance that did not shut down cleanly.
+        QLocalServer.removeServer(name)
+        return self._server.listen(name)
+
+    def close(self):
+        self._server.close()
+        for sock in list(self._buffers):
+            sock.disconnectFromServer()
+
+    def _on_connection(self):
+        while self._server.hasPendingConnections():
+            sock = self._server.nextPendingConnection()
+            self._buffers[sock] = b""
+            sock.readyRead.connect(lambda sock=sock: self._on_ready_read(sock))
+            sock.disconnected.connect(lambda sock=sock: self._on_disconnected(sock))
+
+    def _on_disconnected(self, sock: QLocalSocket):
+        self._buffers.pop(sock, None)
+        sock.deleteLater()
+
+    def _on_ready_read(self, sock: QLocalSocket):
+        buffer = self._buffers.get(sock, b"") + bytes(sock.readAll())
+        *lines, buffer = buffer.split(b"\n")
+        if len(buffer) > MAX_REQUEST_BYTES:
+            sock.abort()
+            return
+        self._buffers[sock] = buffer
+        for line in lines:
+            if line.strip():
+                self._submit(sock, line)
+
+    def _submit(self, sock: QLocalSocket, line: bytes):
+        request = None
+        try:
+            request = json.loads(line)
+            request["input"], request["output"]
+        except (ValueError, TypeError, KeyError) as exc:
+            request_id = request.get("id") if isinstance(request, dict) else None
+            self._reply(sock, {"id": request_id, "error": f"bad request: {exc}"})
+            return
+        job = CallTask(_sanitize_request, request)
+        job.signals.done.connect(lambda entry, job=job: self._on_done(sock, job, entry))
+        self._jobs.add(job)
+        self.pool.start(job)
+
+    def _on_done(self, sock: QLocalSocket, job: CallTask, entry: dict):
+        self._jobs.discard(job)
+        self._reply(sock, entry)
+
+    def _reply(self, sock: QLocalSocket, entry: dict):
+        # The client may have gone away while the image was processed.
+        if sock in self._buffers:
+            sock.write(json.dumps(entry, ensure_ascii=False).encode() + b"\n")
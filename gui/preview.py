@@ -1,19 +1,45 @@
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QApplication, QFileDialog, QSizePolicy
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QApplication, QFileDialog, QSizePolicy, QLabel, QComboBox,
+    QProgressBar
 )
-from PyQt6.QtCore import Qt, QRect, QPoint, QSize
+from PyQt6.QtCore import Qt, QRect, QRectF, QPoint, QSize
 from PyQt6.QtGui import QPainter, QColor, QPixmap, QPen, QCursor
+import itertools
+import math
+import os
 
-from core.sanitizer import render_image, save_clean
+from core import profiling
+from core.compositor import BlurCompositor
+from core.profiling import span
+from core.spatial import GridIndex
+from gui.qt_bridge import frame_to_qimage
+from gui.worker import ExportTask
+
+
+# Widget pixels around a rectangle that its outline can paint into.
+OUTLINE_MARGIN = 3
+# File dialog filters and the extension each one adds to a bare file name.
+SAVE_FILTERS = {
+    "PNG (*.png)": ".png",
+    "JPEG (*.jpg *.jpeg)": ".jpg",
+    "WebP (*.webp)": ".webp",
+}
 
 
 class ImageCanvas(QWidget):
     def __init__(self, cv_image, ocr_boxes: list, auto_regions: list[tuple]):
         super().__init__()
         self.cv_image = cv_image
-        self.ocr_boxes = ocr_boxes
+        self.ocr_boxes: list = []
+        # Regions by stable id, in insertion order; lower ids win hit-tests.
         # Each region: {'rect': (x,y,w,h), 'active': bool, 'auto': bool}
-        self._regions: list[dict] = [{'rect': r, 'active': True, 'auto': True} for r in auto_regions]
+        self._regions: dict[int, dict] = {}
+        self._region_ids = itertools.count()
+        self._region_index = GridIndex()
+        self._ocr_index = GridIndex()
+        for rect in auto_regions:
+            self._add_region(rect, auto=True)
+        self._add_ocr_boxes(ocr_boxes)
         self._hovered_region_idx: int | None = None
         self._hovered_ocr_idx: int | None = None
         self._drag_start: QPoint | None = None
@@ -21,16 +47,91 @@ class ImageCanvas(QWidget):
         self._is_dragging = False
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.setMouseTracking(True)
+        self.trace_id = profiling.current_trace()
+        self._compositor = BlurCompositor(cv_image)
+        # Wraps the compositor's buffer without copying; dirty rectangles are
+        # re-uploaded into the pixmap from here.
+        self._frame_image = frame_to_qimage(self._compositor.frame)
         self._rendered_pixmap: QPixmap | None = None
         self._rerender()
 
+    @property
+    def mode(self) -> str:
+        return self._compositor.mode
+
+    @property
+    def frame(self):
+        """The composited image on screen; it changes with every edit."""
+        return self._compositor.frame
+
+    def set_mode(self, mode: str):
+        with profiling.trace(self.trace_id):
+            with span("preview.composite", mode=mode) as attrs:
+                dirty = self._compositor.set_mode(mode)
+                attrs["dirty"] = len(dirty)
+            self._upload(dirty)
+
     def _rerender(self):
-        self._rendered_pixmap = render_image(self.cv_image, self.blur_regions)
-        self.update()
+        with profiling.trace(self.trace_id):
+            regions = self.blur_regions
+            with span("preview.composite", regions=len(regions)) as attrs:
+                dirty = self._compositor.update(regions)
+                attrs["dirty"] = len(dirty)
+            self._upload(dirty)
+
+    def _upload(self, dirty: list[tuple]):
+        with span("preview.upload", rects=len(dirty)):
+            if self._rendered_pixmap is None:
+                self._rendered_pixmap = QPixmap.fromImage(self._frame_image)
+                self.update()
+                return
+            if dirty:
+                painter = QPainter(self._rendered_pixmap)
+                for x, y, w, h in dirty:
+                    painter.drawImage(QPoint(x, y), self._frame_image, QRect(x, y, w, h))
+                painter.end()
+        for rect in dirty:
+            self._update_image_rect(rect)
+
+    def _add_region(self, rect: tuple, auto: bool):
+        region_id = next(self._region_ids)
+        self._regions[region_id] = {'rect': tuple(rect), 'active': True, 'auto': auto}
+        self._region_index.insert(region_id, rect)
+
+    def _remove_region(self, region_id: int):
+        region = self._regions.pop(region_id)
+        self._region_index.remove(region_id)
+        self._update_image_rect(region['rect'])
+
+    def _add_ocr_boxes(self, ocr_boxes: list):
+        for box in ocr_boxes:
+            self._ocr_index.insert(len(self.ocr_boxes), box["rect"])
+            self.ocr_boxes.append(box)
+
+    def add_detections(self, ocr_boxes: list, auto_regions: list[tuple]):
+        self._add_ocr_boxes(ocr_boxes)
+        for rect in auto_regions:
+            self._add_region(rect, auto=True)
+        if auto_regions:
+            self._rerender()
 
     @property
     def blur_regions(self) -> list[tuple]:
-        return [r['rect'] for r in self._regions if r['active']]
+        return [r['rect'] for r in self._regions.values() if r['active']]
+
+    def _update_image_rect(self, rect: tuple):
+        m = OUTLINE_MARGIN
+        self.update(self._img_to_widget(rect).adjusted(-m, -m, m, m))
+
+    def _widget_rect_to_img(self, rect: QRect) -> tuple[int, int, int, int]:
+        sx, sy, scale = self._scale_params()
+        if scale == 0:
+            return 0, 0, 0, 0
+        x0 = math.floor((rect.left() - sx) / scale)
+        y0 = math.floor((rect.top() - sy) / scale)
+        x1 = math.ceil((rect.right() + 1 - sx) / scale)
+        y1 = math.ceil((rect.bottom() + 1 - sy) / scale)
+        return x0, y0, x1 - x0, y1 - y0
 
     def _img_to_widget(self, rect: tuple) -> QRect:
         x, y, w, h = rect
@@ -53,19 +154,13 @@ class ImageCanvas(QWidget):
 
     def _region_at(self, pos: QPoint) -> int | None:
         img_pos = self._widget_to_img(pos)
-        for i, region in enumerate(self._regions):
-            x, y, w, h = region['rect']
-            if x <= img_pos.x() <= x + w and y <= img_pos.y() <= y + h:
-                return i
-        return None
+        hits = self._region_index.at(img_pos.x(), img_pos.y())
+        return min(hits) if hits else None
 
     def _ocr_box_at(self, pos: QPoint) -> int | None:
         img_pos = self._widget_to_img(pos)
-        for i, line in enumerate(self.ocr_boxes):
-            x, y, w, h = line["rect"]
-            if x <= img_pos.x() <= x + w and y <= img_pos.y() <= y + h:
-                return i
-        return None
+        hits = self._ocr_index.at(img_pos.x(), img_pos.y())
+        return min(hits) if hits else None
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
@@ -75,7 +170,7 @@ class ImageCanvas(QWidget):
         elif event.button() == Qt.MouseButton.RightButton:
             region_idx = self._region_at(event.pos())
             if region_idx is not None:
-                self._regions.pop(region_idx)
+                self._remove_region(region_idx)
                 self._hovered_region_idx = None
                 self._rerender()
 
@@ -87,8 +182,11 @@ class ImageCanvas(QWidget):
             if not self._is_dragging and (abs(delta.x()) > 5 or abs(delta.y()) > 5):
                 self._is_dragging = True
             if self._is_dragging:
+                previous = QRect(self._drag_start, self._drag_current).normalized()
                 self._drag_current = pos
-                self.update()
+                current = QRect(self._drag_start, self._drag_current).normalized()
+                m = OUTLINE_MARGIN
+                self.update(previous.united(current).adjusted(-m, -m, m, m))
                 return
 
         prev_region = self._hovered_region_idx
@@ -105,8 +203,11 @@ class ImageCanvas(QWidget):
         else:
             self.setCursor(QCursor(Qt.CursorShape.CrossCursor))
 
-        if prev_region != self._hovered_region_idx or prev_ocr != self._hovered_ocr_idx:
-            self.update()
+        # Only the OCR box highlight is drawn for hover.
+        if prev_ocr != self._hovered_ocr_idx:
+            for idx in (prev_ocr, self._hovered_ocr_idx):
+                if idx is not None:
+                    self._update_image_rect(self.ocr_boxes[idx]["rect"])
 
     def mouseReleaseEvent(self, event):
         if event.button() != Qt.MouseButton.LeftButton:
@@ -123,8 +224,10 @@ class ImageCanvas(QWidget):
                 w = min(img_w - x, p2.x() - p1.x())
                 h = min(img_h - y, p2.y() - p1.y())
                 if w > 0 and h > 0:
-                    self._regions.append({'rect': (x, y, w, h), 'active': True, 'auto': False})
+                    self._add_region((x, y, w, h), auto=False)
                     self._rerender()
+            m = OUTLINE_MARGIN
+            self.update(widget_rect.adjusted(-m, -m, m, m))
         else:
             pos = event.pos()
             region_idx = self._region_at(pos)
@@ -134,7 +237,7 @@ class ImageCanvas(QWidget):
             else:
                 ocr_idx = self._ocr_box_at(pos)
                 if ocr_idx is not None:
-                    self._regions.append({'rect': tuple(self.ocr_boxes[ocr_idx]["rect"]), 'active': True, 'auto': False})
+                    self._add_region(self.ocr_boxes[ocr_idx]["rect"], auto=False)
                     self._rerender()
 
         self._drag_start = None
@@ -142,23 +245,33 @@ class ImageCanvas(QWidget):
         self._is_dragging = False
 
     def leaveEvent(self, event):
+        if self._hovered_ocr_idx is not None:
+            self._update_image_rect(self.ocr_boxes[self._hovered_ocr_idx]["rect"])
         self._hovered_region_idx = None
         self._hovered_ocr_idx = None
-        self.update()
 
     def paintEvent(self, event):
         if self._rendered_pixmap is None:
             return
 
+        clip = event.rect()
         painter = QPainter(self)
+        painter.setClipRect(clip)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
         ox, oy, scale = self._scale_params()
-        pw = int(self._rendered_pixmap.width() * scale)
-        ph = int(self._rendered_pixmap.height() * scale)
-        painter.drawPixmap(int(ox), int(oy), pw, ph, self._rendered_pixmap)
-
-        for region in self._regions:
+        # Only the part of the pixmap under the dirty rectangle is scaled and drawn.
+        cx, cy, cw, ch = self._widget_rect_to_img(clip)
+        source = QRect(cx, cy, cw, ch).intersected(self._rendered_pixmap.rect())
+        if not source.isEmpty():
+            target = QRectF(ox + source.x() * scale, oy + source.y() * scale,
+                            source.width() * scale, source.height() * scale)
+            painter.drawPixmap(target, self._rendered_pixmap, QRectF(source))
+
+        pad = math.ceil(OUTLINE_MARGIN / scale) if scale else 0
+        visible = self._region_index.intersecting((cx - pad, cy - pad, cw + 2 * pad, ch + 2 * pad))
+        for region_id in sorted(visible):
+            region = self._regions[region_id]
             wr = self._img_to_widget(region['rect'])
             if region['active']:
                 color = QColor(255, 160, 0, 200) if region['auto'] else QColor(255, 80, 80, 200)
@@ -189,7 +302,7 @@ class ImageCanvas(QWidget):
         return QSize(600, 400)
 
     def current_pixmap(self) -> QPixmap:
-        return render_image(self.cv_image, self.blur_regions)
+        return self._rendered_pixmap
 
 
 class PreviewWindow(QWidget):
@@ -197,30 +310,115 @@ class PreviewWindow(QWidget):
         super().__init__()
         self.setWindowTitle("Blurveil Preview")
         self.canvas = ImageCanvas(cv_image, ocr_boxes, auto_regions)
+        self._analysis = None
         hint = self.canvas.sizeHint()
         self.resize(hint.width(), hint.height() + 60)
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(8, 8, 8, 8)
         main_layout.setSpacing(8)
         main_layout.addWidget(self.canvas)
+        self.status_label = QLabel()
+        self.status_label.hide()
+        main_layout.addWidget(self.status_label)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.hide()
+        main_layout.addWidget(self.progress_bar)
+        self._export: ExportTask | None = None
         buttons_layout = QHBoxLayout()
-        btn_copy = QPushButton("Скопировать в буфер")
-        btn_copy.clicked.connect(self.copy_to_clipboard)
-        buttons_layout.addWidget(btn_copy)
-        btn_save = QPushButton("Сохранить как...")
-        btn_save.clicked.connect(self.save_to_file)
-        buttons_layout.addWidget(btn_save)
+        self.mode_combo = QComboBox()
+        for label, mode in (("Размытие", "blur"), ("Пикселизация", "pixelate"), ("Заливка", "solid")):
+            self.mode_combo.addItem(label, mode)
+        self.mode_combo.currentIndexChanged.connect(
+            lambda _: self.canvas.set_mode(self.mode_combo.currentData()))
+        buttons_layout.addWidget(self.mode_combo)
+        self.btn_copy = QPushButton("Скопировать в буфер")
+        self.btn_copy.clicked.connect(self.copy_to_clipboard)
+        buttons_layout.addWidget(self.btn_copy)
+        self.btn_save = QPushButton("Сохранить как...")
+        self.btn_save.clicked.connect(self.save_to_file)
+        buttons_layout.addWidget(self.btn_save)
         main_layout.addLayout(buttons_layout)
         self.setLayout(main_layout)
 
+    def attach_analysis(self, task):
+        self._analysis = task
+        task.signals.progress.connect(self._on_analysis_progress)
+        task.signals.finished.connect(self._on_analysis_finished)
+        task.signals.failed.connect(self._on_analysis_failed)
+        self.status_label.setText("Сканирование…")
+        self.status_label.show()
+        # Nothing leaves the window until every detection is on the canvas.
+        self._set_exportable(False)
+
+    def _set_exportable(self, exportable: bool):
+        for widget in (self.mode_combo, self.btn_copy, self.btn_save):
+            widget.setEnabled(exportable)
+
+    def _on_analysis_progress(self, ocr_boxes: list, regions: list):
+        self.canvas.add_detections(ocr_boxes, regions)
+
+    def _on_analysis_finished(self, result: dict):
+        self._analysis = None
+        self.status_label.setText(f"Найдено регионов: {len(result['auto_regions'])}")
+        self._set_exportable(True)
+
+    def _on_analysis_failed(self, message: str):
+        self._analysis = None
+        self.status_label.setText(f"Ошибка сканирования: {message}")
+        # Regions can still be marked by hand.
+        self._set_exportable(True)
+
+    def closeEvent(self, event):
+        if self._analysis is not None:
+            self._analysis.cancel()
+            self._analysis = None
+        if self._export is not None:
+            self._export.cancel()
+            self._export = None
+        super().closeEvent(event)
+
     def copy_to_clipboard(self):
-        QApplication.clipboard().setPixmap(self.canvas.current_pixmap())
+        if self._analysis is not None:
+            return
+        # The pixmap on screen already holds the composited image.
+        with profiling.trace(self.canvas.trace_id), span("clipboard"):
+            QApplication.clipboard().setPixmap(self.canvas.current_pixmap())
         self.close()
 
     def save_to_file(self):
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "Сохранить изображение", "", "PNG Images (*.png);;JPEG Images (*.jpg)"
+        # The written file must carry every region the analysis finds.
+        if self._analysis is not None:
+            return
+        file_path, chosen = QFileDialog.getSaveFileName(
+            self, "Сохранить изображение", "", ";;".join(SAVE_FILTERS)
         )
-        if file_path:
-            save_clean(self.canvas.cv_image, self.canvas.blur_regions, file_path)
-            self.close()
+        if not file_path:
+            return
+        if not os.path.splitext(file_path)[1]:
+            file_path += SAVE_FILTERS.get(chosen, ".png")
+        # The canvas frame is encoded in place, so it must not change meanwhile.
+        self._set_editable(False)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        with profiling.trace(self.canvas.trace_id):
+            self._export = ExportTask(self.canvas.frame, file_path)
+        self._export.signals.progress.connect(lambda fraction: self.progress_bar.setValue(round(100 * fraction)))
+        self._export.signals.finished.connect(self._on_export_finished)
+        self._export.signals.failed.connect(self._on_export_failed)
+        self._export.start()
+
+    def _set_editable(self, editable: bool):
+        for widget in (self.canvas, self.mode_combo, self.btn_copy, self.btn_save):
+            widget.setEnabled(editable)
+
+    def _on_export_finished(self, path: str):
+        self._export = None
+        self.close()
+
+    def _on_export_failed(self, message: str):
+        self._export = None
+        self.progress_bar.hide()
+        self._set_editable(True)
+        self.status_label.setText(f"Ошибка сохранения: {message}")
+        self.status_label.show()
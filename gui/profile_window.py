@@ -0,0 +1,52 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QPlainTextEdit, QFileDialog
+from PyQt6.QtGui import QFontDatabase
+
+from core.cache import default_cache
+from core.profiling import profiler
+
+
+def format_report() -> str:
+    stats = default_cache.stats()
+    cache_line = (f"cache: {stats['entries']} entries, {stats['bytes'] / 1024:.0f} KiB, "
+                  f"hit rate {stats['hit_rate']:.0%} (hits {stats['hits']}, disk {stats['disk_hits']}, "
+                  f"crops {stats['crop_hits']}, misses {stats['misses']}, evictions {stats['evictions']})")
+    return f"{profiler.report()}\n\n{cache_line}"
+
+
+class ProfileWindow(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Blurveil — профилирование")
+        self.resize(900, 600)
+        layout = QVBoxLayout()
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        layout.addWidget(self.text)
+        buttons_layout = QHBoxLayout()
+        btn_refresh = QPushButton("Обновить")
+        btn_refresh.clicked.connect(self.refresh)
+        buttons_layout.addWidget(btn_refresh)
+        btn_export = QPushButton("Экспорт JSONL…")
+        btn_export.clicked.connect(self.export)
+        buttons_layout.addWidget(btn_export)
+        btn_clear = QPushButton("Очистить")
+        btn_clear.clicked.connect(self.clear)
+        buttons_layout.addWidget(btn_clear)
+        layout.addLayout(buttons_layout)
+        self.setLayout(layout)
+        self.refresh()
+
+    def refresh(self):
+        self.text.setPlainText(format_report())
+
+    def export(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Экспорт профиля", "blurveil-profile.jsonl", "JSON Lines (*.jsonl)"
+        )
+        if file_path:
+            profiler.dump(file_path)
+
+    def clear(self):
+        profiler.clear()
+        self.refresh()
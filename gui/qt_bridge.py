@@ -0,0 +1,38 @@
+"""Qt adapters for the NumPy/OpenCV core in core.sanitizer."""
+import numpy as np
+from PyQt6.QtGui import QImage, QPixmap
+
+from core.sanitizer import analyze_array, render_array
+
+
+def frame_to_qimage(frame) -> QImage:
+    """Wrap a contiguous BGR or BGRA frame in a QImage without copying.
+
+    The QImage borrows the frame's memory, so the frame must outlive it.
+    """
+    height, width, channels = frame.shape
+    # On little-endian machines BGRA bytes are exactly Qt's 0xAARRGGBB RGB32.
+    fmt = QImage.Format.Format_RGB32 if channels == 4 else QImage.Format.Format_BGR888
+    return QImage(frame.data, width, height, frame.strides[0], fmt)
+
+
+def qpixmap_to_cv_image(pixmap: QPixmap):
+    qimage = pixmap.toImage().convertToFormat(QImage.Format.Format_BGR888)
+    width = qimage.width()
+    height = qimage.height()
+    ptr = qimage.constBits()
+    ptr.setsize(qimage.sizeInBytes())
+    rows = np.frombuffer(ptr, np.uint8).reshape((height, qimage.bytesPerLine()))
+    return rows[:, :width * 3].reshape((height, width, 3)).copy()
+
+
+def cv_image_to_qpixmap(cv_img):
+    return QPixmap.fromImage(frame_to_qimage(np.ascontiguousarray(cv_img)))
+
+
+def analyze_image(pixmap: QPixmap) -> dict:
+    return analyze_array(qpixmap_to_cv_image(pixmap))
+
+
+def render_image(cv_image, regions: list[tuple[int, int, int, int]], mode: str = "blur") -> QPixmap:
+    return cv_image_to_qpixmap(render_array(cv_image, regions, mode))
@@ -1,12 +1,18 @@
 from PyQt6.QtWidgets import QWidget, QApplication
 from PyQt6.QtCore import Qt, QRect, QRectF, QPoint, pyqtSignal
-from PyQt6.QtGui import QPainter, QPainterPath, QColor, QImage, QPixmap
+from PyQt6.QtGui import QPainter, QPainterPath, QColor, QPixmap
 import platform
-import mss
-import numpy as np
 
-from core.sanitizer import analyze_image
+from core import frame, profiling
+from core.cache import crop_result
+from core.profiling import span
+from gui.capture import ScreenCapture
+from gui.qt_bridge import frame_to_qimage
 from gui.preview import PreviewWindow
+from gui.worker import AnalysisTask, SpeculativeAnalysis
+
+# Start analysing the captured desktop as soon as the overlay opens.
+SPECULATIVE_ANALYSIS = True
 
 
 def _macos_activate():
@@ -18,51 +24,78 @@ def _macos_activate():
             pass
 
 
-def _grab_virtual_desktop() -> QPixmap:
-    """Capture the entire virtual desktop (all monitors/spaces) using mss.
+class SnippingWidget(QWidget):
+    """Full-screen selection overlay, built once and reused for every snip.
 
-    QScreen.grabWindow(0) only captures the primary screen on Windows,
-    and may miss other spaces/monitors on macOS. mss.monitors[0] always
-    returns the bounding box of all monitors combined.
+    start() grabs the monitor under the cursor and shows the overlay over
+    it; reset() hides it again and drops the grabbed frame.
     """
-    with mss.mss() as sct:
-        monitor = sct.monitors[0]
-        screenshot = sct.grab(monitor)
-    img = np.frombuffer(screenshot.bgra, dtype=np.uint8).reshape(screenshot.height, screenshot.width, 4)
-    img_rgb = np.ascontiguousarray(img[:, :, [2, 1, 0]])  # BGRA → RGB
-    height, width = img_rgb.shape[:2]
-    qimage = QImage(img_rgb.data, width, height, width * 3, QImage.Format.Format_RGB888)
-    return QPixmap.fromImage(qimage.copy())
-
 
-class SnippingWidget(QWidget):
     preview_ready = pyqtSignal(object)
 
-    def __init__(self):
+    def __init__(self, capture: ScreenCapture | None = None):
         super().__init__()
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint |
                             Qt.WindowType.WindowStaysOnTopHint |
                             Qt.WindowType.Tool)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         self.setCursor(Qt.CursorShape.CrossCursor)
-
-        screen = QApplication.primaryScreen()
-        virtual_geometry = screen.virtualGeometry()
-        self.setGeometry(virtual_geometry)
-
-        self.original_pixmap = _grab_virtual_desktop()
-
-        self.pixel_ratio = self.original_pixmap.width() / virtual_geometry.width()
+        self.capture = capture or ScreenCapture()
+        self.frame = None
+        self.original_pixmap: QPixmap | None = None
+        self.pixel_ratio = 1.0
+        self.begin = QPoint()
+        self.end = QPoint()
+        self.is_selecting = False
+        self._speculation = None
+        # Create the native window now so a snip only has to show it.
+        self.create()
+
+    def start(self):
+        if self.isVisible():
+            self.reset()
+        profiling.new_trace()
+        # The overlay covers only the monitor under the cursor. The selection
+        # is cut from this frame rather than re-grabbed: it is already at
+        # native resolution and is what the user saw while selecting.
+        grabbed = self.capture.grab_under_cursor()
+        self.setGeometry(grabbed.geometry)
+        self.frame = grabbed.frame
+        with span("capture.upload", size=profiling.image_size(self.frame)):
+            self.original_pixmap = QPixmap.fromImage(frame_to_qimage(self.frame))
+
+        self.pixel_ratio = grabbed.pixel_ratio
         self.original_pixmap.setDevicePixelRatio(self.pixel_ratio)
 
         self.begin = QPoint()
         self.end = QPoint()
         self.is_selecting = False
 
+        if SPECULATIVE_ANALYSIS:
+            self._speculate()
+
         self.show()
 
+    def _speculate(self):
+        # A snip that was aborted leaves its speculation running, since an
+        # OCR call cannot be interrupted; it ends up in the frame cache.
+        # Reuse it for an unchanged screen instead of starting a second one.
+        previous = self._speculation
+        if previous is not None and previous.running and previous.covers(self.frame):
+            return
+        if previous is not None:
+            previous.cancel()
+        self._speculation = SpeculativeAnalysis(self.frame)
+        self._speculation.start()
+
+    def reset(self):
+        self.hide()
+        self.frame = None
+        self.original_pixmap = None
+
     def paintEvent(self, event):
+        if self.original_pixmap is None:
+            return
         painter = QPainter(self)
         painter.drawPixmap(0, 0, self.original_pixmap)
 
@@ -99,7 +132,7 @@ class SnippingWidget(QWidget):
         QApplication.processEvents()
 
         if rect.width() < 10 or rect.height() < 10:
-            self.close()
+            self.reset()
             return
 
         x = int(rect.x() * self.pixel_ratio)
@@ -107,16 +140,35 @@ class SnippingWidget(QWidget):
         w = int(rect.width() * self.pixel_ratio)
         h = int(rect.height() * self.pixel_ratio)
 
-        cropped = self.original_pixmap.copy(x, y, w, h)
-        cropped.setDevicePixelRatio(1.0)
-
-        result = analyze_image(cropped)
-        self.open_preview(result)
-
-        self.close()
-
-    def open_preview(self, result: dict):
-        self.preview = PreviewWindow(result["cv_image"], result["ocr_boxes"], result["auto_regions"])
+        with span("crop", size=f"{w}x{h}"):
+            cv_image = frame.to_bgr(frame.crop(self.frame, (x, y, w, h)))
+        speculation = self._speculation
+        if speculation is not None and speculation.result is not None:
+            self._speculation = None
+            self.open_preview(cv_image, result=crop_result(speculation.result, (x, y, w, h)))
+        else:
+            if speculation is not None and speculation.worth_waiting((x, y, w, h)):
+                # The task waits for it and crops its result.
+                self._speculation = None
+            else:
+                # Left running into the frame cache for the next snip.
+                speculation = None
+            task = AnalysisTask(cv_image, frame=self.frame, rect=(x, y, w, h), speculation=speculation)
+            self.open_preview(cv_image, task=task)
+            task.start()
+
+        self.reset()
+
+    def closeEvent(self, event):
+        self.reset()
+        super().closeEvent(event)
+
+    def open_preview(self, cv_image, task: AnalysisTask | None = None, result: dict | None = None):
+        if result is not None:
+            self.preview = PreviewWindow(cv_image, result["ocr_boxes"], result["auto_regions"])
+        else:
+            self.preview = PreviewWindow(cv_image, [], [])
+            self.preview.attach_analysis(task)
         _macos_activate()
         self.preview.show()
         self.preview.activateWindow()
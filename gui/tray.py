@@ -1,8 +1,14 @@
-from PyQt6.QtWidgets import QSystemTrayIcon, QMenu
+from PyQt6.QtWidgets import QSystemTrayIcon, QMenu, QFileDialog
 from PyQt6.QtGui import QIcon, QPixmap, QAction
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThreadPool
+from core import ocr
+from core.sanitizer import warm_up
+from gui.capture import ScreenCapture
 from gui.snipper import SnippingWidget
 from gui.hotkey import HotkeyHandler
+from gui.ipc import IpcServer
+from gui.profile_window import ProfileWindow
+from gui.watch import WatchService
 import platform
 
 
@@ -18,13 +24,25 @@ def _macos_activate():
 class BlurveilTrayApp:
     def __init__(self, app):
         self.app = app
-        self.snipper = None
         self._previews: list = []
+        self.profile_window = None
+        self.capture = ScreenCapture()
+        # One overlay, built hidden now and shown on every hotkey press.
+        self.snipper = SnippingWidget(self.capture)
+        self.snipper.preview_ready.connect(self._on_preview_ready)
+        self.watch = WatchService()
+        self.watch.processed.connect(self._on_watch_processed)
 
         self.hotkey_handler = HotkeyHandler("<ctrl>+<shift>+s")
         self.hotkey_handler.activated.connect(self.start_snipping)
         self.hotkey_handler.start()
 
+        ocr.import_engine()
+        QThreadPool.globalInstance().start(warm_up)
+        # Lets `blurveil --remote` and other local tools use this warm process.
+        self.ipc = IpcServer()
+        self.ipc.start()
+
         if not QIcon.hasThemeIcon("edit-cut"):
             pixmap = QPixmap(16, 16)
             pixmap.fill(Qt.GlobalColor.green)
@@ -40,6 +58,22 @@ class BlurveilTrayApp:
         action_snip.triggered.connect(self.start_snipping)
         menu.addAction(action_snip)
 
+        watch_menu = menu.addMenu("Наблюдение")
+        action_watch_dir = QAction("Следить за папкой…", self.app)
+        action_watch_dir.triggered.connect(self.choose_watch_directory)
+        watch_menu.addAction(action_watch_dir)
+        self.action_watch_clipboard = QAction("Следить за буфером обмена", self.app)
+        self.action_watch_clipboard.setCheckable(True)
+        self.action_watch_clipboard.toggled.connect(self.watch.watch_clipboard)
+        watch_menu.addAction(self.action_watch_clipboard)
+        action_watch_stop = QAction("Остановить наблюдение", self.app)
+        action_watch_stop.triggered.connect(self.stop_watching)
+        watch_menu.addAction(action_watch_stop)
+
+        action_profile = QAction("Профилирование", self.app)
+        action_profile.triggered.connect(self.show_profile)
+        menu.addAction(action_profile)
+
         action_quit = QAction("Выход", self.app)
         action_quit.triggered.connect(self.quit_app)
         menu.addAction(action_quit)
@@ -48,24 +82,55 @@ class BlurveilTrayApp:
         self.tray_icon.show()
 
     def start_snipping(self):
-        if self.snipper is not None:
-            try:
-                self.snipper.close()
-            except RuntimeError:
-                pass
-            self.snipper = None
-
         _macos_activate()
-        self.snipper = SnippingWidget()
-        self.snipper.preview_ready.connect(self._on_preview_ready)
-        self.snipper.show()
+        self.snipper.start()
         self.snipper.activateWindow()
 
     def _on_preview_ready(self, preview):
         self._previews.append(preview)
         preview.destroyed.connect(lambda: self._previews.remove(preview) if preview in self._previews else None)
 
+    def choose_watch_directory(self):
+        directory = QFileDialog.getExistingDirectory(None, "Папка для наблюдения")
+        if directory:
+            self.watch.watch_directory(directory)
+            self._update_tooltip()
+
+    def stop_watching(self):
+        self.action_watch_clipboard.setChecked(False)
+        self.watch.stop()
+        self._update_tooltip()
+
+    def _on_watch_processed(self, entry: dict):
+        if "error" in entry:
+            self.tray_icon.showMessage("Blurveil", f"{entry.get('input', '')}: {entry['error']}",
+                                       QSystemTrayIcon.MessageIcon.Warning)
+        self._update_tooltip()
+
+    def _update_tooltip(self):
+        tooltip = f"Blurveil ({self.hotkey_handler.hotkey})"
+        if self.watch.active:
+            sources = [str(self.watch.directory)] if self.watch.directory else []
+            if self.action_watch_clipboard.isChecked():
+                sources.append("буфер обмена")
+            tooltip += (f"\nНаблюдение: {', '.join(sources)}"
+                        f"\nОбработано: {self.watch.done}, ошибок: {self.watch.failed}")
+        self.tray_icon.setToolTip(tooltip)
+
+    def show_profile(self):
+        if self.profile_window is None:
+            self.profile_window = ProfileWindow()
+        else:
+            self.profile_window.refresh()
+        self.profile_window.show()
+        self.profile_window.activateWindow()
+        self.profile_window.raise_()
+
     def quit_app(self):
         self.hotkey_handler.stop()
+        self.ipc.close()
+        self.snipper.close()
+        self.capture.close()
+        self.watch.stop()
         self.tray_icon.hide()
         self.app.quit()
\ No newline at end of file
@@ -0,0 +1,210 @@
+import os
+import time
+from collections import deque
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, QThreadPool, QTimer, QFileSystemWatcher, pyqtSignal
+from PyQt6.QtGui import QGuiApplication
+
+from core.batch import IMAGE_SUFFIXES, output_path, sanitize_file
+from core.cache import image_key
+from core.sanitizer import analyze_array, render_array
+from gui.qt_bridge import cv_image_to_qpixmap, qpixmap_to_cv_image
+from gui.worker import CallTask
+
+WATCH_WORKERS = 2
+# Paths waiting for a worker. Files beyond this stay on disk and are picked
+# up by the rescan that follows each finished job.
+MAX_QUEUED = 64
+# A file is processed once it has not been modified for this long.
+SETTLE_MS = 700
+CLEAN_SUFFIX = "_clean"
+SEEN_KEYS = 256
+
+
+def _sanitize_path(src: str, dst: str) -> dict:
+    try:
+        return sanitize_file(src, dst)
+    except Exception as exc:
+        return {"input": src, "output": dst, "error": str(exc)}
+
+
+def _sanitize_clipboard(cv_image) -> dict:
+    result = analyze_array(cv_image)
+    return {"image": render_array(cv_image, result["auto_regions"]), "regions": len(result["auto_regions"])}
+
+
+class WatchService(QObject):
+    """Sanitizes new images from a watched folder and/or the clipboard.
+
+    Work runs on a private thread pool. At most MAX_QUEUED file paths wait
+    for a worker, and at most one clipboard image (the latest) does, so a
+    burst costs bounded memory. Each file version (path, size, mtime) and
+    each clipboard image content is processed once. Results go next to the
+    source with CLEAN_SUFFIX, and back onto the clipboard respectively.
+    """
+
+    processed = pyqtSignal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(WATCH_WORKERS)
+        self.directory: Path | None = None
+        self._watcher = QFileSystemWatcher()
+        self._watcher.directoryChanged.connect(self._schedule_scan)
+        self._scan_timer = QTimer()
+        self._scan_timer.setSingleShot(True)
+        self._scan_timer.timeout.connect(self._scan)
+        self._queue: deque[str] = deque()
+        # Keeps jobs (and their signal objects) alive until their result arrives.
+        self._jobs: set[CallTask] = set()
+        self._seen_files: dict[str, tuple[int, int]] = {}
+        self._running = 0
+        self._clipboard = False
+        self._clipboard_next = None
+        self._clipboard_busy = False
+        self._seen_keys: deque[str] = deque(maxlen=SEEN_KEYS)
+        self.done = 0
+        self.failed = 0
+
+    @property
+    def active(self) -> bool:
+        return self.directory is not None or self._clipboard
+
+    def watch_directory(self, directory: str):
+        self.stop_directory()
+        self.directory = Path(directory)
+        # Only images that appear from now on are processed.
+        for path in self._candidates():
+            self._seen_files[str(path)] = self._version(path)
+        self._watcher.addPath(str(self.directory))
+
+    def stop_directory(self):
+        if self.directory is not None:
+            self._watcher.removePath(str(self.directory))
+        self.directory = None
+        self._queue.clear()
+        self._seen_files.clear()
+
+    def watch_clipboard(self, enabled: bool):
+        clipboard = QGuiApplication.clipboard()
+        if enabled and not self._clipboard:
+            clipboard.dataChanged.connect(self._on_clipboard)
+        elif not enabled and self._clipboard:
+            clipboard.dataChanged.disconnect(self._on_clipboard)
+            self._clipboard_next = None
+        self._clipboard = enabled
+
+    def stop(self):
+        self.stop_directory()
+        self.watch_clipboard(False)
+
+    @staticmethod
+    def _version(path: Path) -> tuple[int, int]:
+        stat = path.stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def _candidates(self):
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return
+        for entry in entries:
+            path = Path(entry.path)
+            if (entry.is_file() and path.suffix.lower() in IMAGE_SUFFIXES
+                    and not path.stem.endswith(CLEAN_SUFFIX)):
+                yield path
+
+    def _schedule_scan(self, *_):
+        if not self._scan_timer.isActive():
+            self._scan_timer.start(SETTLE_MS)
+
+    def _scan(self):
+        if self.directory is None:
+            return
+        now = time.time_ns()
+        settling = False
+        for path in self._candidates():
+            if len(self._queue) >= MAX_QUEUED:
+                break
+            key = str(path)
+            try:
+                version = self._version(path)
+            except OSError:
+                continue
+            if self._seen_files.get(key) == version or key in self._queue:
+                continue
+            if now - version[1] < SETTLE_MS * 1_000_000:
+                settling = True
+                continue
+            self._seen_files[key] = version
+            self._queue.append(key)
+        if settling:
+            self._schedule_scan()
+        self._drain()
+
+    def _drain(self):
+        while self._queue and self._running < WATCH_WORKERS:
+            src = self._queue.popleft()
+            dst = output_path(Path(src), Path(Path(src).name), None, CLEAN_SUFFIX)
+            job = CallTask(_sanitize_path, src, str(dst))
+            job.signals.done.connect(lambda entry, job=job: self._on_file_done(job, entry))
+            self._jobs.add(job)
+            self._running += 1
+            self.pool.start(job)
+
+    def _on_file_done(self, job: CallTask, entry: dict):
+        self._jobs.discard(job)
+        self._running -= 1
+        self._count(entry)
+        self.processed.emit(entry)
+        if self._queue:
+            self._drain()
+        else:
+            # Files skipped while the queue was full are still on disk.
+            self._schedule_scan()
+
+    def _on_clipboard(self):
+        mime = QGuiApplication.clipboard().mimeData()
+        if mime is None or not mime.hasImage():
+            return
+        pixmap = QGuiApplication.clipboard().pixmap()
+        if pixmap.isNull():
+            return
+        cv_image = qpixmap_to_cv_image(pixmap)
+        key = image_key(cv_image)
+        if key in self._seen_keys:
+            return
+        self._seen_keys.append(key)
+        self._clipboard_next = cv_image
+        self._start_clipboard()
+
+    def _start_clipboard(self):
+        if self._clipboard_busy or self._clipboard_next is None:
+            return
+        cv_image, self._clipboard_next = self._clipboard_next, None
+        job = CallTask(_sanitize_clipboard, cv_image)
+        job.signals.done.connect(lambda entry, job=job: self._on_clipboard_done(job, entry))
+        self._jobs.add(job)
+        self._clipboard_busy = True
+        self.pool.start(job)
+
+    def _on_clipboard_done(self, job: CallTask, entry: dict):
+        self._jobs.discard(job)
+        self._clipboard_busy = False
+        image = entry.pop("image", None)
+        if image is not None and self._clipboard:
+            # Our own write comes back through dataChanged; skip it by content.
+            self._seen_keys.append(image_key(image))
+            QGuiApplication.clipboard().setPixmap(cv_image_to_qpixmap(image))
+        entry["input"] = "clipboard"
+        self._count(entry)
+        self.processed.emit(entry)
+        self._start_clipboard()
+
+    def _count(self, entry: dict):
+        if "error" in entry:
+            self.failed += 1
+        else:
+            self.done += 1
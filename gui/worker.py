@@ -0,0 +1,252 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+import contextvars
+import threading
+
+import numpy as np
+
+from core import export, frame as frames, ocr
+from core.cache import crop_result, default_cache, image_key
+from core.profiling import span
+from core.sanitizer import analyze_array, AnalysisCancelled
+
+
+# A selection covering at least this share of a frame that is OCR'd in tiles
+# waits for the frame's speculation rather than being analysed on its own.
+SPECULATION_WAIT_SHARE = 0.5
+
+
+class AnalysisSignals(QObject):
+    progress = pyqtSignal(list, list)
+    finished = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+
+class AnalysisTask(QRunnable):
+    """Runs analyze_array on the global QThreadPool.
+
+    Signals are delivered to the GUI thread through queued connections.
+    Nothing is emitted after cancel() has been called. When the source frame
+    and the crop rectangle are given, a cached result for the whole frame is
+    translated instead of analysing the crop again. A still running
+    SpeculativeAnalysis of that frame that is passed in is waited for and
+    cropped from (see SpeculativeAnalysis.worth_waiting).
+    """
+
+    def __init__(self, cv_image, frame=None, rect: tuple | None = None, cache=default_cache,
+                 speculation: "SpeculativeAnalysis | None" = None):
+        super().__init__()
+        self.cv_image = cv_image
+        self.frame = frame
+        self.rect = rect
+        self.cache = cache
+        self.speculation = speculation
+        self.signals = AnalysisSignals()
+        self._cancelled = threading.Event()
+        # Spans recorded on the pool thread belong to the creator's trace.
+        self._context = contextvars.copy_context()
+
+    def start(self):
+        QThreadPool.globalInstance().start(self)
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def _on_progress(self, ocr_boxes: list, regions: list):
+        if not self.cancelled:
+            self.signals.progress.emit(ocr_boxes, regions)
+
+    def _cached_crop(self) -> dict | None:
+        if self.cache is None or self.frame is None or not self.cache.has_frames:
+            return None
+        cached = self.cache.get_crop(image_key(self.frame), self.rect)
+        if cached is None:
+            return None
+        self._on_progress(list(cached["ocr_boxes"]), list(cached["auto_regions"]))
+        return {"cv_image": self.cv_image, **cached}
+
+    def _speculative_crop(self) -> dict | None:
+        if self.speculation is None:
+            return None
+        with span("speculation.wait"):
+            while not self.speculation.wait(0.05):
+                if self.cancelled:
+                    raise AnalysisCancelled()
+        if self.speculation.result is None:
+            return None
+        cropped = crop_result(self.speculation.result, self.rect)
+        self._on_progress(list(cropped["ocr_boxes"]), list(cropped["auto_regions"]))
+        return {"cv_image": self.cv_image, **cropped}
+
+    def run(self):
+        self._context.run(self._run)
+
+    def _run(self):
+        try:
+            result = self._speculative_crop() or self._cached_crop() or analyze_array(
+                self.cv_image, on_progress=self._on_progress,
+                is_cancelled=self._cancelled.is_set, cache=self.cache)
+        except AnalysisCancelled:
+            return
+        except Exception as exc:
+            if not self.cancelled:
+                self.signals.failed.emit(str(exc))
+            return
+        if not self.cancelled:
+            self.signals.finished.emit(result)
+
+
+class SpeculativeAnalysis(QRunnable):
+    """Analyses a whole captured frame while the user is still selecting.
+
+    The result is kept on the task for the snipper to crop from, and stored
+    in the cache as a frame entry so a re-snip of an unchanged screen can
+    reuse it too. A frame already in the cache is not analysed again.
+
+    cancel() takes effect between analysis stages only: a Tesseract call
+    that has started runs to completion.
+    """
+
+    def __init__(self, frame, cache=default_cache):
+        super().__init__()
+        self.frame = frame
+        self.shape = frame.shape[:2]
+        self.cache = cache
+        self.result: dict | None = None
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        self._context = contextvars.copy_context()
+
+    def start(self):
+        QThreadPool.globalInstance().start(self)
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the analysis has ended; False if ``timeout`` ran out first."""
+        return self._done.wait(timeout)
+
+    @property
+    def running(self) -> bool:
+        return not self._done.is_set()
+
+    def worth_waiting(self, rect: tuple) -> bool:
+        """Whether a selection ``rect`` of the frame should wait for this analysis.
+
+        Without tiling the frame holds the in-process OCR engine, which the
+        crop would queue behind anyway. Tiles run in worker processes, so
+        there only a selection covering most of the frame waits; a smaller
+        one is analysed sooner on its own.
+        """
+        height, width = self.shape
+        if not ocr.settings.tiled or ocr.settings.workers <= 1 or height * width < ocr.settings.min_tiled_pixels:
+            return True
+        return rect[2] * rect[3] >= SPECULATION_WAIT_SHARE * height * width
+
+    def covers(self, frame) -> bool:
+        """Whether this is still analysing the same pixels as ``frame``."""
+        own = self.frame
+        return own is not None and own.shape == frame.shape and np.array_equal(own, frame)
+
+    def run(self):
+        self._context.run(self._run)
+
+    def _run(self):
+        try:
+            self.result = self._analyze()
+        except Exception:
+            # Cancelled or failed: the selection is analysed normally.
+            pass
+        finally:
+            # The snipper may keep this task after an aborted snip.
+            self.frame = None
+            self._done.set()
+
+    def _analyze(self) -> dict:
+        key = image_key(self.frame) if self.cache is not None else None
+        if key is not None:
+            height, width = self.frame.shape[:2]
+            cached = self.cache.get_crop(key, (0, 0, width, height))
+            if cached is not None:
+                return cached
+        result = analyze_array(frames.to_bgr(self.frame), is_cancelled=self._cancelled.is_set)
+        result.pop("cv_image")
+        if key is not None:
+            self.cache.put_frame(key, result)
+        return result
+
+
+class CallSignals(QObject):
+    done = pyqtSignal(dict)
+
+
+class CallTask(QRunnable):
+    """Runs ``fn(*args)``, which returns a dict, and emits it as ``done``.
+
+    An exception is reported as {"error": message}. The owner must keep the
+    task referenced until ``done`` arrives.
+    """
+
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = CallSignals()
+
+    def run(self):
+        try:
+            entry = self.fn(*self.args)
+        except Exception as exc:
+            entry = {"error": str(exc)}
+        self.signals.done.emit(entry)
+
+
+class ExportSignals(QObject):
+    progress = pyqtSignal(float)
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+
+class ExportTask(QRunnable):
+    """Encodes a frame to a file on the global QThreadPool (see core.export).
+
+    The frame is read, not copied, so it must not change until a finished or
+    failed signal arrives. After cancel() nothing is emitted and no file is
+    left behind.
+    """
+
+    def __init__(self, frame, path: str, quality: int | None = None, compression: int = export.PNG_COMPRESSION):
+        super().__init__()
+        self.frame = frame
+        self.path = path
+        self.quality = quality
+        self.compression = compression
+        self.signals = ExportSignals()
+        self._cancelled = threading.Event()
+        self._context = contextvars.copy_context()
+
+    def start(self):
+        QThreadPool.globalInstance().start(self)
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        self._context.run(self._run)
+
+    def _run(self):
+        try:
+            export.write_image(self.frame, self.path, self.quality, self.compression,
+                               on_progress=self.signals.progress.emit, is_cancelled=self._cancelled.is_set)
+        except export.ExportCancelled:
+            return
+        except Exception as exc:
+            if not self._cancelled.is_set():
+                self.signals.failed.emit(str(exc))
+            return
+        if not self._cancelled.is_set():
+            self.signals.finished.emit(self.path)
@@ -1,14 +1,36 @@
+import argparse
 import sys
-from PyQt6.QtWidgets import QApplication
-from gui.tray import BlurveilTrayApp
+
 
 def main():
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(prog="blurveil-gui")
+    parser.add_argument("--profile", action="store_true",
+                        help="print per-stage timings to stderr on exit")
+    parser.add_argument("--profile-export", metavar="PATH",
+                        help="append every timing span to PATH as JSON lines")
+    args, qt_args = parser.parse_known_args()
+
+    # Imported here, not at module level: spawned OCR workers re-import this
+    # script as __mp_main__ and must not load Qt, pynput or the GUI.
+    from PyQt6.QtWidgets import QApplication
+    from core.profiling import profiler
+    from gui.profile_window import format_report
+    from gui.tray import BlurveilTrayApp
+
+    if args.profile_export:
+        profiler.export_to(args.profile_export)
+
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setQuitOnLastWindowClosed(False)
-    
-    tray = BlurveilTrayApp(app)
-    
-    sys.exit(app.exec())
+
+    tray = BlurveilTrayApp(app)  # noqa: F841 - keeps the tray alive
+
+    code = app.exec()
+    if args.profile:
+        print(format_report(), file=sys.stderr)
+    profiler.export_to(None)
+    sys.exit(code)
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
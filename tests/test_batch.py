@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import pytest
+
+from core import batch, cli
+from core.batch import iter_inputs, output_path, unique_path
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    for name in ("top.png", "notes.txt", "a/x.png", "a/deep/y.jpg", "b/x.png"):
+        path = tmp_path / "in" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _rels(specs, recursive=False) -> list[str]:
+    return [rel.as_posix() for _, rel in iter_inputs(specs, recursive)]
+
+
+def test_directory_inputs(tree):
+    assert _rels(["in"]) == ["top.png"]
+    assert _rels(["in"], recursive=True) == ["a/deep/y.jpg", "a/x.png", "b/x.png", "top.png"]
+
+
+def test_glob_keeps_path_below_pattern_prefix(tree):
+    assert _rels(["in/**/*.png"]) == ["a/x.png", "b/x.png", "top.png"]
+    assert _rels(["in/*/x.png"]) == ["a/x.png", "b/x.png"]
+    assert _rels([str(tree / "in" / "a" / "*.png")]) == ["x.png"]
+
+
+def test_files_and_duplicates(tree):
+    assert _rels(["in/a/x.png", "in/a/../a/x.png", "in/notes.txt", "in/**/x.png"]) == ["x.png", "b/x.png"]
+
+
+def test_output_path():
+    src = Path("in/a/x.png")
+    assert output_path(src, Path("a/x.png"), "out", "_clean") == Path("out/a/x_clean.png")
+    assert output_path(src, Path("a/x.png"), None, "_clean", ".jpg") == Path("in/a/x_clean.jpg")
+
+
+def test_unique_path():
+    taken: set[str] = set()
+    assert unique_path(Path("out/x_clean.png"), taken) == Path("out/x_clean.png")
+    assert unique_path(Path("out/x_clean.png"), taken) == Path("out/x_clean_2.png")
+    assert unique_path(Path("out/x_clean.png"), taken) == Path("out/x_clean_3.png")
+    assert unique_path(Path("out/y_clean.png"), taken) == Path("out/y_clean.png")
+
+
+def test_cli_never_gives_two_jobs_one_output(tree, monkeypatch):
+    submitted = []
+
+    def fake_run_batch(jobs, *options):
+        submitted.extend(jobs)
+        return iter([])
+
+    monkeypatch.setattr(cli, "run_batch", fake_run_batch)
+    assert cli.main(["in/**/*.png", "in/a/x.png", "in/b/x.png", "-o", "out"]) == 0
+    outputs = [Path(dst).as_posix() for _, dst in submitted]
+    assert outputs == ["out/a/x_clean.png", "out/b/x_clean.png", "out/top_clean.png"]
+
+    submitted.clear()
+    assert cli.main([str(tree / "in" / "a" / "x.png"), str(tree / "in" / "b" / "x.png"), "-o", "out"]) == 0
+    assert [Path(dst).as_posix() for _, dst in submitted] == ["out/x_clean.png", "out/x_clean_2.png"]
+
+
+def test_glob_root():
+    assert batch._glob_root("in/**/*.png") == Path("in")
+    assert batch._glob_root("*.png") == Path()
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from core import blur
+
+
+@pytest.fixture
+def image():
+    rng = np.random.default_rng(1)
+    cells = rng.integers(0, 256, (30, 40, 3), np.uint8)
+    return np.ascontiguousarray(np.repeat(np.repeat(cells, 10, 0), 10, 1))
+
+
+def _outside(image, regions):
+    mask = np.ones(image.shape[:2], bool)
+    for x, y, w, h in regions:
+        mask[max(0, y):max(0, y + h), max(0, x):max(0, x + w)] = False
+    return mask
+
+
+def _assert_matches_full_frame(result, image, regions, mode):
+    # The gaussian of a window may differ from a full-frame pass by a rounding step.
+    tolerance = 3 if mode == "blur" else 0
+    full = blur.obscured(image, mode)
+    inside = ~_outside(image, regions)
+    assert np.abs(result[inside].astype(int) - full[inside]).max() <= tolerance
+    assert np.array_equal(result[~inside], image[~inside])
+
+
+@pytest.mark.parametrize("mode", blur.MODES)
+@pytest.mark.parametrize("regions", [
+    # Far apart: one window per region.
+    [(5, 7, 30, 20), (350, 260, 40, 30)],
+    # Close together and overlapping: one bounding window.
+    [(100, 100, 60, 40), (130, 120, 60, 40), (170, 110, 20, 50)],
+    # Cut by the image edges.
+    [(-15, -5, 40, 30), (380, 290, 50, 50)],
+])
+def test_apply_matches_full_frame_effect(image, mode, regions):
+    _assert_matches_full_frame(blur.apply(image, regions, mode), image, regions, mode)
+
+
+@pytest.mark.parametrize("mode", blur.MODES)
+def test_apply_without_visible_regions_copies(image, mode):
+    for regions in ([], [(500, 500, 10, 10), (10, 10, 0, 5)]):
+        result = blur.apply(image, regions, mode)
+        assert result is not image
+        assert np.array_equal(result, image)
+
+
+def test_solid_fills_with_colour(image):
+    result = blur.apply(image, [(3, 4, 10, 5)], "solid")
+    assert (result[4:9, 3:13] == blur.SOLID_COLOR).all()
+
+
+def test_overlaps_are_not_obscured_twice(image):
+    rect = (100, 100, 60, 40)
+    assert np.array_equal(blur.apply(image, [rect, rect, (120, 110, 20, 20)]), blur.apply(image, [rect]))
+
+
+def test_window_snaps_to_grid_and_clips():
+    assert blur._window((100, 100), (20, 20, 10, 10), 0, 16) == (16, 16, 32, 32)
+    assert blur._window((100, 100), (90, -5, 30, 10), 0, 16) == (80, 0, 100, 16)
+    assert blur._window((100, 100), (20, 20, 10, 10), 25, 1) == (0, 0, 55, 55)
+    assert blur._window((100, 100), (120, 20, 10, 10), 0, 1) is None
+
+
+@pytest.mark.parametrize("mode", blur.MODES)
+def test_obscured_keeps_shape(mode):
+    for shape in ((7, 5, 3), (37, 101, 3)):
+        assert blur.obscured(np.zeros(shape, np.uint8), mode).shape == shape
+
+
+def test_unknown_mode_raises(image):
+    with pytest.raises(ValueError):
+        blur.apply(image, [(0, 0, 5, 5)], "smudge")
+    with pytest.raises(ValueError):
+        blur.obscured(image, "smudge")
@@ -0,0 +1,79 @@
+import numpy as np
+
+from core.cache import AnalysisCache, crop_result, image_key
+
+
+def _result() -> dict:
+    detections = [{"rect": (10, 10, 20, 10), "rule": "Email"}, {"rect": (90, 40, 30, 30), "rule": "QR"},
+                  {"rect": (300, 300, 5, 5), "rule": "IP"}]
+    return {
+        "ocr_boxes": [{"rect": (10, 10, 20, 10), "text": "a@b.io"}, {"rect": (0, 0, 5, 5), "text": "x"}],
+        "auto_regions": [d["rect"] for d in detections],
+        "detections": detections,
+    }
+
+
+def test_crop_result_translates_and_clips():
+    cropped = crop_result(_result(), (5, 5, 100, 50))
+    assert cropped["ocr_boxes"] == [{"rect": (5, 5, 20, 10), "text": "a@b.io"}]
+    # The QR box is cut by the crop edge and kept, clipped.
+    assert cropped["detections"] == [{"rect": (5, 5, 20, 10), "rule": "Email"},
+                                     {"rect": (85, 35, 15, 15), "rule": "QR"}]
+    assert cropped["auto_regions"] == [(5, 5, 20, 10), (85, 35, 15, 15)]
+
+
+def test_crop_result_of_whole_frame_is_identity():
+    result = _result()
+    cropped = crop_result(result, (0, 0, 1000, 1000))
+    assert cropped["detections"] == result["detections"]
+    assert cropped["ocr_boxes"] == result["ocr_boxes"]
+
+
+def test_crop_result_outside_everything():
+    assert crop_result(_result(), (500, 500, 10, 10)) == {"ocr_boxes": [], "auto_regions": [], "detections": []}
+
+
+def test_cache_get_crop_needs_frame_entry():
+    cache = AnalysisCache()
+    cache.put("plain", _result())
+    assert not cache.has_frames
+    assert cache.get_crop("plain", (0, 0, 50, 50)) is None
+    cache.put_frame("frame", _result())
+    assert cache.get_crop("frame", (5, 5, 100, 50))["auto_regions"] == [(5, 5, 20, 10), (85, 35, 15, 15)]
+    assert cache.stats()["crop_hits"] == 1
+
+
+def test_image_key_depends_on_pixels_and_shape():
+    image = np.zeros((4, 6, 3), np.uint8)
+    assert image_key(image) == image_key(image.copy())
+    assert image_key(image) != image_key(image.reshape(6, 4, 3))
+    changed = image.copy()
+    changed[3, 5, 2] = 1
+    assert image_key(image) != image_key(changed)
+    assert image_key(image[:, ::2]) == image_key(np.ascontiguousarray(image[:, ::2]))
+
+
+def test_cache_evicts_least_recently_used():
+    # Room for two results.
+    cache = AnalysisCache(max_bytes=3000)
+    cache.put("a", _result())
+    cache.put("b", _result())
+    cache.get("a")
+    cache.put("c", _result())
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_returns_copies():
+    cache = AnalysisCache()
+    cache.put("k", _result())
+    cache.get("k")["auto_regions"].clear()
+    assert len(cache.get("k")["auto_regions"]) == 3
+
+
+def test_disk_cache_survives_restart(tmp_path):
+    AnalysisCache(disk_dir=str(tmp_path)).put("k", _result())
+    fresh = AnalysisCache(disk_dir=str(tmp_path))
+    assert fresh.get("k")["detections"] == _result()["detections"]
+    assert fresh.stats()["disk_hits"] == 1
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from core import blur
+from core.compositor import BlurCompositor
+
+REGIONS = [(10, 10, 100, 50), (60, 30, 80, 60), (200, 150, 150, 100), (-20, 250, 60, 80), (380, 0, 50, 30)]
+
+
+@pytest.fixture
+def image():
+    rng = np.random.default_rng(0)
+    cells = rng.integers(0, 256, (30, 40, 3), np.uint8)
+    return np.ascontiguousarray(np.repeat(np.repeat(cells, 10, 0), 10, 1))
+
+
+def _assert_matches_apply(frame, image, regions, mode):
+    expected = blur.apply(image, regions, mode)
+    diff = np.abs(frame.astype(int) - expected)
+    # apply() blurs a window around the regions, the compositor the whole frame: the gaussian may differ by a
+    # rounding step, pixelate and solid are exact.
+    assert diff.max() <= (3 if mode == "blur" else 0)
+
+
+@pytest.mark.parametrize("mode", blur.MODES)
+def test_incremental_updates_match_apply(image, mode):
+    compositor = BlurCompositor(image, mode)
+    steps = [REGIONS[:1], REGIONS[:3], REGIONS, REGIONS[1:4], [], REGIONS[2:]]
+    for regions in steps:
+        compositor.update(regions)
+        _assert_matches_apply(compositor.frame, image, regions, mode)
+    assert np.array_equal(compositor.source, image)
+
+
+def test_update_returns_clipped_dirty_rects(image):
+    compositor = BlurCompositor(image)
+    assert compositor.update([(-20, 250, 60, 80), (380, 0, 50, 30)]) == [(0, 250, 40, 50), (380, 0, 20, 30)]
+    assert compositor.update([(-20, 250, 60, 80), (380, 0, 50, 30)]) == []
+    assert compositor.update([(380, 0, 50, 30)]) == [(0, 250, 40, 50)]
+    assert np.array_equal(compositor.frame[250:, :40], image[250:, :40])
+    assert compositor.update([(500, 500, 10, 10)]) == [(380, 0, 20, 30)]
+    assert np.array_equal(compositor.frame, image)
+
+
+def test_duplicate_region_stays_until_last_copy_is_removed(image):
+    rect = (10, 10, 100, 50)
+    compositor = BlurCompositor(image, "solid")
+    compositor.update([rect, rect])
+    compositor.update([rect])
+    assert not compositor.frame[10:60, 10:110].any()
+    compositor.update([])
+    assert np.array_equal(compositor.frame, image)
+
+
+def test_removing_overlapping_region_keeps_the_other(image):
+    compositor = BlurCompositor(image, "pixelate")
+    compositor.update(REGIONS[:2])
+    compositor.update(REGIONS[1:2])
+    _assert_matches_apply(compositor.frame, image, REGIONS[1:2], "pixelate")
+
+
+def test_set_mode(image):
+    compositor = BlurCompositor(image, "blur")
+    compositor.update(REGIONS)
+    assert compositor.set_mode("blur") == []
+    assert compositor.set_mode("solid")
+    assert compositor.mode == "solid"
+    _assert_matches_apply(compositor.frame, image, REGIONS, "solid")
+    with pytest.raises(ValueError):
+        compositor.set_mode("smudge")
+    assert compositor.mode == "solid"
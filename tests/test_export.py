@@ -0,0 +1,70 @@
+import io
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from core import export
+
+
+def _frame(height: int, width: int, channels: int = 3, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).integers(0, 256, (height, width, channels), np.uint8)
+
+
+def _decode(data: bytes) -> np.ndarray:
+    return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_UNCHANGED)
+
+
+@pytest.mark.parametrize("height", [1, export.PNG_BAND_ROWS, 2 * export.PNG_BAND_ROWS + 37])
+@pytest.mark.parametrize("compression", [0, 1, 9])
+def test_write_png_round_trip(height, compression):
+    image = _frame(height, 61)
+    out = io.BytesIO()
+    export._write_png(out, image, compression, None, None)
+    assert np.array_equal(_decode(out.getvalue()), image)
+
+
+def test_write_png_drops_alpha():
+    image = _frame(300, 40, channels=4)
+    out = io.BytesIO()
+    export._write_png(out, image, 1, None, None)
+    assert np.array_equal(_decode(out.getvalue()), image[:, :, :3])
+
+
+def test_write_png_reads_non_contiguous_views():
+    frame = _frame(200, 100, channels=4)
+    view = frame[10:190, 20:80]
+    out = io.BytesIO()
+    export._write_png(out, view, 1, None, None)
+    assert np.array_equal(_decode(out.getvalue()), view[:, :, :3])
+
+
+def test_write_png_reports_progress():
+    progress = []
+    export._write_png(io.BytesIO(), _frame(300, 8), 1, progress.append, None)
+    assert progress == sorted(progress) and progress[-1] == 1.0
+    assert len(progress) == 3
+
+
+def test_write_image_cancel_leaves_nothing(tmp_path):
+    path = tmp_path / "out.png"
+    with pytest.raises(export.ExportCancelled):
+        export.write_image(_frame(300, 8), str(path), is_cancelled=lambda: True)
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("name", ["out.png", "out.jpg", "out.webp"])
+def test_write_image_formats(tmp_path, name):
+    image = np.full((64, 48, 3), 200, np.uint8)
+    path = tmp_path / name
+    export.write_image(image, str(path))
+    decoded = cv2.imread(str(path))
+    assert decoded.shape == image.shape
+    assert os.listdir(tmp_path) == [name]
+
+
+def test_format_for():
+    assert export.format_for("a/B.JPEG") == "jpeg"
+    assert export.format_for("shot.png") == "png"
+    assert export.format_for("shot.tiff") == ".tiff"
@@ -0,0 +1,111 @@
+import pytest
+
+from core.detectors import detect_spans
+from core.ocr import BLOCK_STRIDE, OCR_FIELDS, OcrBackend, _merge_bands, parse_tsv, split_bands
+
+HEADER = "\t".join(OCR_FIELDS)
+
+
+def _data(*words: dict) -> dict:
+    data = {name: [] for name in OCR_FIELDS}
+    for word in words:
+        values = {"level": 5, "page_num": 1, "block_num": 1, "par_num": 1, "line_num": 1, "word_num": 1,
+                  "left": 0, "top": 0, "width": 10, "height": 10, "conf": 90, "text": "w", **word}
+        for name in OCR_FIELDS:
+            data[name].append(values[name])
+    return data
+
+
+def test_parse_tsv():
+    tsv = "\n".join([
+        HEADER,
+        "1\t1\t0\t0\t0\t0\t0\t0\t640\t480\t-1\t",
+        "5\t1\t2\t1\t3\t4\t10\t20\t30\t12\t96.5\thunter2",
+        "5\t1\t2\t1\t3\t5\t50\t20\t8\t12\t-1",
+        "garbage",
+    ])
+    data = parse_tsv(tsv)
+    assert set(data) == set(OCR_FIELDS)
+    assert data["text"] == ["", "hunter2", ""]
+    assert data["conf"] == [-1, 96.5, -1]
+    assert data["left"] == [0, 10, 50]
+    assert data["block_num"][1] == 2 and data["line_num"][1] == 3
+
+
+def test_parse_tsv_empty():
+    assert parse_tsv(HEADER) == {name: [] for name in OCR_FIELDS}
+
+
+def test_backend_must_implement_image_to_data():
+    with pytest.raises(TypeError):
+        OcrBackend()
+
+    class Fixed(OcrBackend):
+        def image_to_data(self, image) -> dict:
+            return parse_tsv(HEADER)
+
+    assert Fixed().image_to_data(None)["text"] == []
+
+
+def test_split_bands():
+    assert split_bands(100, 200, 20) == [(0, 100)]
+    assert split_bands(250, 100, 20) == [(0, 100), (80, 180), (160, 250)]
+    with pytest.raises(ValueError):
+        split_bands(100, 20, 20)
+
+
+def test_merge_bands_offsets_and_renumbers():
+    bands = [(0, 100), (60, 160)]
+    merged = _merge_bands(bands, [_data({"text": "top", "top": 10}), _data({"text": "bottom", "top": 70})], 160)
+    assert merged["text"] == ["top", "bottom"]
+    assert merged["top"] == [10, 130]
+    assert merged["block_num"] == [1, 1 + BLOCK_STRIDE]
+
+
+def test_merge_bands_drops_duplicates_in_overlap():
+    bands = [(0, 100), (60, 160)]
+    first = _data({"text": "seam", "top": 70, "left": 5, "width": 40, "height": 12})
+    second = _data({"text": "seam", "top": 10, "left": 5, "width": 40, "height": 12})
+    merged = _merge_bands(bands, [first, second], 160)
+    assert merged["text"] == ["seam"]
+
+
+def test_merge_bands_prefers_uncut_word():
+    bands = [(0, 100), (60, 160)]
+    # Cut by the bottom edge of the first band, seen whole in the second.
+    cut = _data({"text": "sec", "top": 88, "left": 5, "width": 40, "height": 12})
+    whole = _data({"text": "secret", "top": 28, "left": 5, "width": 40, "height": 18})
+    merged = _merge_bands(bands, [cut, whole], 160)
+    assert merged["text"] == ["secret"]
+    assert merged["top"] == [88] and merged["height"] == [18]
+
+
+def test_merge_bands_skips_empty_words():
+    merged = _merge_bands([(0, 50)], [_data({"text": " "}, {"text": "kept"})], 50)
+    assert merged["text"] == ["kept"]
+
+
+def _line(texts: list[str], top: int, heights: list[int], block: int) -> dict:
+    return _data(*({"text": text, "left": 10 + 60 * i, "top": top, "width": 50, "height": h, "block_num": block,
+                    "word_num": i + 1} for i, (text, h) in enumerate(zip(texts, heights))))
+
+
+def _detected(merged: dict) -> list[list[str]]:
+    keys = zip(merged["block_num"], merged["par_num"], merged["line_num"])
+    words = [{"text": text, "line": key} for text, key in zip(merged["text"], keys)]
+    return [[words[i]["text"] for i in idxs] for idxs, _ in detect_spans(words)]
+
+
+@pytest.mark.parametrize("texts, flagged", [
+    (["card", "4111", "1111", "1111", "1111"], ["4111", "1111", "1111", "1111"]),
+    (["password:", "hunter2"], ["hunter2"]),
+])
+def test_merge_bands_keeps_seam_line_from_one_band(texts, flagged):
+    # Both bands read the seam line; their boxes differ by a pixel per word.
+    bands = [(0, 256), (160, 416)]
+    first = _line(texts, 200, [20 + i % 2 for i in range(len(texts))], block=3)
+    second = _line(texts, 40, [21 - i % 2 for i in range(len(texts))], block=1)
+    merged = _merge_bands(bands, [first, second], 416)
+    assert merged["text"] == texts
+    assert len(set(merged["block_num"])) == 1
+    assert _detected(merged) == [flagged]
@@ -0,0 +1,49 @@
+from core.spatial import GridIndex
+
+
+def test_at_includes_edges():
+    index = GridIndex(cell=16)
+    index.insert("a", (10, 10, 20, 5))
+    assert index.at(10, 10) == ["a"]
+    assert index.at(30, 15) == ["a"]
+    assert index.at(31, 15) == []
+    assert index.at(9, 12) == []
+
+
+def test_rect_spanning_many_cells():
+    index = GridIndex(cell=16)
+    index.insert("wide", (0, 0, 100, 40))
+    assert all(index.at(x, 20) == ["wide"] for x in range(0, 101, 7))
+    assert index.intersecting((90, 30, 50, 50)) == {"wide"}
+
+
+def test_intersecting():
+    index = GridIndex(cell=32)
+    index.insert(1, (0, 0, 10, 10))
+    index.insert(2, (50, 50, 10, 10))
+    index.insert(3, (200, 0, 10, 10))
+    assert index.intersecting((5, 5, 50, 50)) == {1, 2}
+    assert index.intersecting((100, 100, 10, 10)) == set()
+
+
+def test_insert_moves_existing_key():
+    index = GridIndex(cell=16)
+    index.insert("k", (0, 0, 10, 10))
+    index.insert("k", (100, 100, 10, 10))
+    assert len(index) == 1
+    assert index.at(5, 5) == []
+    assert index.at(105, 105) == ["k"]
+    assert index.rect("k") == (100, 100, 10, 10)
+
+
+def test_remove_and_clear():
+    index = GridIndex(cell=16)
+    index.insert("a", (0, 0, 40, 40))
+    index.insert("b", (20, 20, 10, 10))
+    index.remove("a")
+    index.remove("missing")
+    assert "a" not in index and "b" in index
+    assert index.at(25, 25) == ["b"]
+    assert index._cells.keys() == {(1, 1)}
+    index.clear()
+    assert len(index) == 0 and index.at(25, 25) == []